@@ -1,84 +1,154 @@
 import heapq
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
-
-# Representación del tablero 8-Puzzle
+from PuzzletSolvable import is_solvable
+from PuzzletHeuristics import Manhattan
+from PuzzletBits import pack, tile_bits, board_size
+
+# Representación del tablero 8-Puzzle. El tablero es una tupla plana
+# inmutable y key su versión empaquetada en un int (ver PuzzletBits), que
+# sirve de hash ya calculado para los visitados. Los hijos heredan del padre
+# el tamaño y la posición del vacío y calculan key en O(1), sin recorrer el
+# tablero. Con __slots__ cada nodo ocupa una fracción de lo que ocupaba.
 class Puzzle:
+    __slots__ = ('board', 'parent', 'move', 'depth', 'cost', 'size', 'bits', 'blank', 'key')
+
     def __init__(self, board, parent=None, move="", depth=0, cost=0):
-        self.board = board
+        self.board = tuple(int(t) for t in np.asarray(board).ravel())
         self.parent = parent
         self.move = move
         self.depth = depth
         self.cost = cost
-        self.blank_pos = self.find_blank()
+        self.size = board_size(len(self.board))
+        self.bits = tile_bits(self.size)
+        self.blank = self.find_blank()
+        self.key = pack(self.board)
 
     def find_blank(self):
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == 0:
-                    return (i, j)
+        return self.board.index(0)
+
+    @property
+    def blank_pos(self):
+        return divmod(self.blank, self.size)
+
+    # Tablero como lista de filas
+    def rows(self):
+        return [list(self.board[i:i + self.size]) for i in range(0, len(self.board), self.size)]
 
     def possible_moves(self):
         x, y = self.blank_pos
         moves = []
         if x > 0:
             moves.append((x-1, y, "up"))
-        if x < 2:
+        if x < self.size - 1:
             moves.append((x+1, y, "down"))
         if y > 0:
             moves.append((x, y-1, "left"))
-        if y < 2:
+        if y < self.size - 1:
             moves.append((x, y+1, "right"))
         return moves
 
-    def apply_move(self, move):
-        x, y = self.blank_pos
-        new_board = [row[:] for row in self.board]
+    # Hijo que resulta de mover el vacío; si se pasa un NodePool se reutiliza
+    # un nodo descartado en vez de crear uno nuevo
+    def apply_move(self, move, pool=None):
         nx, ny, direction = move
-        new_board[x][y], new_board[nx][ny] = new_board[nx][ny], new_board[x][y]
-        return Puzzle(new_board, parent=self, move=direction, depth=self.depth + 1)
+        blank, target, bits = self.blank, nx * self.size + ny, self.bits
+        tile = self.board[target]
+        new_board = list(self.board)
+        new_board[blank], new_board[target] = tile, 0
+        key = self.key ^ (tile << (bits * target)) ^ (tile << (bits * blank)) \
+            ^ ((blank ^ target) << (bits * len(new_board)))
+        child = pool.acquire() if pool is not None else Puzzle.__new__(Puzzle)
+        child.board = tuple(new_board)
+        child.parent = self
+        child.move = direction
+        child.depth = self.depth + 1
+        child.cost = 0
+        child.size = self.size
+        child.bits = bits
+        child.blank = target
+        child.key = key
+        return child
 
     def is_goal(self, goal):
-        return self.board == goal
+        return self.board == tuple(int(t) for t in np.asarray(goal).ravel())
 
     def __lt__(self, other):
         return self.cost < other.cost
 
-# Heurística: Distancia Manhattan
+    def __eq__(self, other):
+        return isinstance(other, Puzzle) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+# Reserva de nodos: los hijos ya visitados y las entradas repetidas de la
+# frontera se devuelven con release y acquire los vuelve a entregar, así una
+# búsqueda larga no crea y destruye objetos sin parar
+class NodePool:
+    __slots__ = ('free',)
+
+    def __init__(self):
+        self.free = []
+
+    def acquire(self):
+        return self.free.pop() if self.free else Puzzle.__new__(Puzzle)
+
+    def release(self, node):
+        node.parent = None
+        self.free.append(node)
+
+    def __len__(self):
+        return len(self.free)
+
+# Códigos de dirección del vacío usados por la heurística incremental
+MOVE_CODES = {"up": 0, "down": 1, "left": 2, "right": 3}
+
+# Heurística: Distancia Manhattan. Las tablas de Manhattan se construyen una
+# vez por objetivo y se reutilizan en las llamadas siguientes
+_manhattan = {}
+
 def manhattan_distance(board, goal):
-    distance = 0
-    for i in range(9):  # La lista ya es unidimensional con 9 elementos
-        if board[i] != 0:  # Ignorar el espacio vacío
-            x, y = divmod(i, 3)  # Coordenadas actuales en la matriz 3x3
-            goal_x, goal_y = divmod(goal.index(board[i]), 3)  # Coordenadas objetivo
-            distance += abs(x - goal_x) + abs(y - goal_y)
-    return distance
-
-# Algoritmo A* para resolver el 8-Puzzle
-def a_star(initial_board, goal_board):
-    goal = sum(goal_board, [])
+    goal = tuple(int(t) for t in np.asarray(goal).ravel())
+    if goal not in _manhattan:
+        _manhattan[goal] = Manhattan(goal)
+    return _manhattan[goal].evaluate(tuple(int(t) for t in np.asarray(board).ravel()))
+
+# Algoritmo A* para resolver el 8-Puzzle. Los visitados se guardan por key
+# (un int), sin construir tuplas anidadas por cada hijo
+def a_star(initial_board, goal_board, pool=None):
     start_puzzle = Puzzle(initial_board)
-    start_puzzle.cost = manhattan_distance(sum(initial_board, []), goal)
-    
+    goal_key = Puzzle(goal_board).key
+    heuristic = Manhattan(tuple(int(t) for t in np.asarray(goal_board).ravel()))
+    start_puzzle.cost = heuristic.evaluate(start_puzzle.board)
+
     open_list = []
     heapq.heappush(open_list, start_puzzle)
     visited = set()
 
     while open_list:
         current_puzzle = heapq.heappop(open_list)
-        visited.add(tuple(map(tuple, current_puzzle.board)))
-
-        if current_puzzle.is_goal(goal_board):
+        if current_puzzle.key in visited:
+            # Entrada repetida: nunca se expandió, así que nadie la referencia
+            if pool is not None:
+                pool.release(current_puzzle)
+            continue
+        visited.add(current_puzzle.key)
+
+        if current_puzzle.key == goal_key:
             return current_puzzle
 
+        blank = current_puzzle.blank
+        h = current_puzzle.cost - current_puzzle.depth
         for move in current_puzzle.possible_moves():
-            new_puzzle = current_puzzle.apply_move(move)
-            new_board_tuple = tuple(map(tuple, new_puzzle.board))
+            new_puzzle = current_puzzle.apply_move(move, pool)
 
-            if new_board_tuple not in visited:
-                new_puzzle.cost = new_puzzle.depth + manhattan_distance(sum(new_puzzle.board, []), goal)
+            if new_puzzle.key not in visited:
+                # h del hijo en O(1) a partir de la del padre
+                tile = current_puzzle.board[new_puzzle.blank]
+                new_puzzle.cost = new_puzzle.depth + heuristic.update(h, tile, blank, MOVE_CODES[move[2]])
                 heapq.heappush(open_list, new_puzzle)
+            elif pool is not None:
+                pool.release(new_puzzle)
 
     return None
 
@@ -86,12 +156,14 @@ def a_star(initial_board, goal_board):
 def reconstruct_path(puzzle):
     path = []
     while puzzle:
-        path.append(puzzle.board)
+        path.append(puzzle.rows())
         puzzle = puzzle.parent
     return path[::-1]
 
-# Función de animación
+# Función de animación (matplotlib se importa solo al animar)
 def animate_solution(solution):
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
     fig, ax = plt.subplots()
     ax.set_axis_off()
     puzzle_images = []
@@ -112,12 +184,17 @@ goal_board = [[1, 2, 3],
               [4, 5, 6],
               [7, 8, 0]]
 
-# Resolver el puzzle
-solution_puzzle = a_star(initial_board, goal_board)
+if __name__ == "__main__":
+    # Descartar tableros sin solución antes de buscar
+    if not is_solvable(initial_board, goal_board):
+        raise SystemExit("El puzzle no tiene solución (la paridad de inversiones no coincide con el objetivo).")
+
+    # Resolver el puzzle
+    solution_puzzle = a_star(initial_board, goal_board)
 
-# Si se encuentra una solución, animar el proceso
-if solution_puzzle:
-    solution_path = reconstruct_path(solution_puzzle)
-    animate_solution(solution_path)
-else:
-    print("No se encontró solución.")
+    # Si se encuentra una solución, animar el proceso
+    if solution_puzzle:
+        solution_path = reconstruct_path(solution_puzzle)
+        animate_solution(solution_path)
+    else:
+        print("No se encontró solución.")
@@ -1,9 +1,17 @@
-import heapq
 import numpy as np
 import time
 import os
-import networkx as nx
-import matplotlib.pyplot as plt
+import sys
+from PuzzletBits import solve_packed
+from PuzzletSolvable import is_solvable
+from PuzzletOracle import solve_with_oracle
+from PuzzletIDA import ida_star
+from PuzzletHeuristics import HEURISTICS, get_heuristic
+from PuzzletBidir import bidirectional_search
+from PuzzletVector import a_star_vectorized
+from PuzzletQueue import QUEUES, TIE_BREAKS
+from PuzzletStats import SolveStats, timed
+from PuzzletBudget import Budget, BudgetExceeded
 
 # Heurísticas: Hamming y Manhattan
 def hamming(state, goal):
@@ -11,7 +19,7 @@ def hamming(state, goal):
 
 def manhattan(state, goal):
     dist = 0
-    for i in range(1, 9):
+    for i in range(1, state.size):
         ix, iy = np.where(state == i)
         gx, gy = np.where(goal == i)
         dist += abs(ix - gx) + abs(iy - gy)
@@ -21,59 +29,143 @@ def manhattan(state, goal):
 def is_goal(state, goal):
     return np.array_equal(state, goal)
 
-# Encuentra las posiciones vecinas (posibles movimientos)
-def neighbors(state):
+# Movimientos del vacío: el código 0..3 es el índice en esta lista y el
+# movimiento opuesto es código ^ 1
+MOVES = [(-1, 0, 'U'), (1, 0, 'D'), (0, -1, 'L'), (0, 1, 'R')]
+
+# Encuentra las posiciones vecinas junto con el código del movimiento
+def neighbors_with_moves(state):
     neighbor_states = []
     zero_pos = np.where(state == 0)
     x, y = zero_pos[0][0], zero_pos[1][0]
+    size = state.shape[0]
     
     # Posibles movimientos
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for dx, dy in directions:
+    for code, (dx, dy, _) in enumerate(MOVES):
         new_x, new_y = x + dx, y + dy
-        if 0 <= new_x < 3 and 0 <= new_y < 3:
+        if 0 <= new_x < size and 0 <= new_y < size:
             new_state = np.copy(state)
             new_state[x, y], new_state[new_x, new_y] = new_state[new_x, new_y], new_state[x, y]
-            neighbor_states.append(new_state)
+            neighbor_states.append((code, new_state))
     
     return neighbor_states
 
-# Algoritmo A* con la opción de elegir entre Hamming y Manhattan
-def a_star(initial_state, goal_state, heuristic):
-    pq = []
-    heapq.heappush(pq, (0, initial_state.tobytes()))
-    came_from = {initial_state.tobytes(): None}
-    cost_so_far = {initial_state.tobytes(): 0}
+# Encuentra las posiciones vecinas (posibles movimientos)
+def neighbors(state):
+    return [new_state for _, new_state in neighbors_with_moves(state)]
+
+# Aplica un movimiento del vacío (código 0..3) y devuelve el nuevo estado
+def apply_move(state, code):
+    zero_pos = np.where(state == 0)
+    x, y = zero_pos[0][0], zero_pos[1][0]
+    dx, dy, _ = MOVES[code]
+    new_state = np.copy(state)
+    new_state[x, y], new_state[x + dx, y + dy] = new_state[x + dx, y + dy], new_state[x, y]
+    return new_state
+
+# Límite de tiempo (segundos) de las búsquedas lanzadas desde main()
+TIME_LIMIT = 120
+
+# Algoritmo A* con la opción de elegir entre Hamming y Manhattan. La frontera
+# es una cola indexada con decrease-key (sin entradas obsoletas), los estados
+# expandidos van a un conjunto cerrado y tie_break decide el desempate a igual f.
+# came_from guarda solo el código del movimiento que llevó a cada estado.
+# Si se pasa un SolveStats, se llena durante la búsqueda. Con weight > 1 es A*
+# ponderado (f = g + weight * h): más rápido y con costo <= weight * óptimo.
+# Con un Budget, al agotarlo lanza BudgetExceeded con el progreso parcial.
+def a_star(initial_state, goal_state, heuristic, tie_break='high_g', queue='bucket', stats=None, weight=1,
+           budget=None):
+    priority = TIE_BREAKS[tie_break]
+    heuristic = timed(heuristic, stats, 'heuristic_time')
+    start_key = initial_state.tobytes()
+    pq = QUEUES[queue]()
+    push = timed(pq.push, stats, 'queue_time')
+    pop = timed(pq.pop, stats, 'queue_time')
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    push(start_key, priority(0, 0, 0))
+    came_from = {start_key: None}
+    cost_so_far = {start_key: 0}
+    h_so_far = {}
+    closed = set()
+    best_key = start_key
     
     while pq:
-        _, current = heapq.heappop(pq)
-        current = np.frombuffer(current, dtype=initial_state.dtype).reshape(initial_state.shape)
+        (f, _), current_key = pop()
+        current = np.frombuffer(current_key, dtype=initial_state.dtype).reshape(initial_state.shape)
         
         if is_goal(current, goal_state):
+            if stats is not None:
+                stats.finish(cost_so_far[current_key])
             return came_from, cost_so_far
+        closed.add(current_key)
         
-        for neighbor in neighbors(current):
-            new_cost = cost_so_far[current.tobytes()] + 1
-            if neighbor.tobytes() not in cost_so_far or new_cost < cost_so_far[neighbor.tobytes()]:
-                cost_so_far[neighbor.tobytes()] = new_cost
-                priority = new_cost + heuristic(neighbor, goal_state)
-                heapq.heappush(pq, (priority, neighbor.tobytes()))
-                came_from[neighbor.tobytes()] = current
+        new_cost = cost_so_far[current_key] + 1
+        children = neighbors_with_moves(current)
+        if stats is not None:
+            stats.nodes_generated += len(children)
+        for code, neighbor in children:
+            key = neighbor.tobytes()
+            if key in closed:
+                if stats is not None:
+                    stats.duplicates_pruned += 1
+                continue
+            if key not in cost_so_far or new_cost < cost_so_far[key]:
+                cost_so_far[key] = new_cost
+                if key not in h_so_far:
+                    h_so_far[key] = heuristic(neighbor, goal_state)
+                push(key, priority(new_cost + weight * h_so_far[key], new_cost, h_so_far[key]))
+                came_from[key] = code
+            elif stats is not None:
+                stats.duplicates_pruned += 1
+        if stats is not None:
+            stats.expanded(len(pq))
+        if budget is not None:
+            if h_so_far.get(current_key, float('inf')) < h_so_far.get(best_key, float('inf')):
+                best_key = current_key
+            if budget.charge(len(pq)):
+                if stats is not None:
+                    stats.finish()
+                best = np.frombuffer(best_key, dtype=initial_state.dtype).reshape(initial_state.shape)
+                raise budget.exceeded(lower_bound=f if weight == 1 else None,
+                                      best_state=tuple(int(t) for t in best.ravel()),
+                                      best_h=h_so_far.get(best_key),
+                                      moves=reconstruct_moves(came_from, initial_state, best))
                 
+    if stats is not None:
+        stats.finish()
     return None, None
 
-# Función para reconstruir el camino
+# Función para obtener los códigos de movimiento: se retrocede desde la meta
+# deshaciendo cada movimiento y se invierte la lista
+def reconstruct_codes(came_from, start, goal):
+    goal = np.asarray(goal, dtype=start.dtype)
+    codes = []
+    current = goal
+    while not np.array_equal(current, start):
+        code = came_from[current.tobytes()]
+        codes.append(code)
+        current = apply_move(current, code ^ 1)
+    codes.reverse()
+    return codes
+
+# Función para obtener la solución como cadena de movimientos, p. ej. "ULDR"
+def reconstruct_moves(came_from, start, goal):
+    if came_from is None:
+        return None
+    return ''.join(MOVES[code][2] for code in reconstruct_codes(came_from, start, goal))
+
+# Función para reconstruir el camino reproduciendo los movimientos desde el inicio
 def reconstruct_path(came_from, start, goal):
     if came_from is None:
         print("No se encontró una solución para el puzzle.")
         return []
 
-    current = goal
-    path = [current]
-    while not np.array_equal(current, start):
-        current = came_from.get(current.tobytes())
-        path.append(current)
-    path.reverse()
+    path = [start]
+    for code in reconstruct_codes(came_from, start, goal):
+        path.append(apply_move(path[-1], code))
     return path
 
 # Función para limpiar la consola (simulación de animación en la consola)
@@ -82,10 +174,12 @@ def clear_console():
 
 # Función para mostrar la cuadrícula en la consola
 def display_grid(state):
+    width = len(str(len(state) ** 2 - 1))
+    border = "+" + ("-" * (width + 2) + "+") * len(state)
     for row in state:
-        print("+---+---+---+")
-        print("| " + " | ".join(f"{num if num != 0 else ' '}" for num in row) + " |")
-    print("+---+---+---+")
+        print(border)
+        print("| " + " | ".join(f"{num if num != 0 else ' ':>{width}}" for num in row) + " |")
+    print(border)
 
 # Función para animar la solución en la consola
 def animate_console_solution(solution, delay=1):
@@ -95,31 +189,38 @@ def animate_console_solution(solution, delay=1):
         time.sleep(delay)
 
 # Función para ingresar el estado inicial manualmente
-def input_puzzle():
-    print("Ingresa 8 números para el puzzle (0 representa el espacio vacío). El espacio restante se rellenará con 0:")
+def input_puzzle(size=3):
+    cells = size * size
+    print(f"Ingresa {cells - 1} números para el puzzle (0 representa el espacio vacío). El espacio restante se rellenará con 0:")
     puzzle = []
     entered_numbers = []
     
-    for i in range(3):
+    for i in range(size):
         while True:
-            row = input(f"Fila {i + 1} (3 números, separados por espacios): ").split()
-            if len(row) == 3 and all(num.isdigit() for num in row):
+            row = input(f"Fila {i + 1} ({size} números, separados por espacios): ").split()
+            if len(row) == size and all(num.isdigit() for num in row):
                 puzzle.append([int(num) for num in row])
                 entered_numbers.extend([int(num) for num in row])
                 break
             else:
-                print("Error: Debes ingresar exactamente 3 números por fila.")
+                print(f"Error: Debes ingresar exactamente {size} números por fila.")
 
-    # Validar que hay exactamente 8 números
-    if len(entered_numbers) == 8:
+    # Validar que hay exactamente size*size - 1 números
+    if len(entered_numbers) == cells - 1:
         puzzle[-1].append(0)  # Añadir el 0 en la posición faltante
-    elif len(entered_numbers) != 9:
-        raise ValueError("Debe haber exactamente 9 números en el puzzle.")
+    elif len(entered_numbers) != cells:
+        raise ValueError(f"Debe haber exactamente {cells} números en el puzzle.")
 
     return np.array(puzzle)
 
-# Función para crear el árbol del puzzle
+# Función para construir el objetivo estándar de un tablero size x size
+def default_goal(size=3):
+    return (np.arange(1, size * size + 1) % (size * size)).reshape((size, size))
+
+# Función para crear el árbol del puzzle. networkx y matplotlib se importan
+# solo al graficar, así el núcleo de búsqueda arranca con NumPy y nada más
 def create_puzzle_tree(path):
+    import networkx as nx
     G = nx.DiGraph()
 
     for i in range(len(path)):
@@ -137,26 +238,44 @@ def format_state(state):
 
 # Función para graficar el árbol con un layout Spring
 def plot_tree(G):
+    import networkx as nx
+    import matplotlib.pyplot as plt
     pos = nx.spring_layout(G, seed=42)  # Establecer una semilla para la reproducibilidad
     plt.figure(figsize=(12, 8))
     nx.draw(G, pos, with_labels=True, node_size=3000, node_color='lightblue', font_size=10, font_weight='bold', arrows=True)
     plt.title("Árbol de Solución del Puzzle")
     plt.show()
 
+# Función para elegir una heurística del registro por su nombre
+def choose_heuristic(goal_state, default='manhattan'):
+    name = input(f"Elige la heurística ({'/'.join(HEURISTICS)}) [{default}]: ").strip() or default
+    return get_heuristic(name, goal_state)
+
 # Función principal para el menú
 def main():
     print("Bienvenido al solver de 8-Puzzle con el algoritmo A*")
-    initial_state = input_puzzle()
+    size_choice = input("Tamaño del tablero (3 para 8-puzzle, 4 para 15-puzzle, 5 para 24-puzzle) [3]: ").strip()
+    size = int(size_choice) if size_choice.isdigit() else 3
+    initial_state = input_puzzle(size)
+
+    goal_state = default_goal(size)
 
-    goal_state = np.array([[1, 2, 3],
-                           [4, 5, 6], 
-                           [7, 8, 0]])
+    # Descartar tableros sin solución antes de buscar
+    if not is_solvable(initial_state, goal_state):
+        print("\nEl puzzle no tiene solución (la paridad de inversiones no coincide con el objetivo).")
+        return
 
     print("\nOpciones:")
     print("1. Resolver con la heurística Hamming.")
     print("2. Resolver con la heurística Manhattan.")
     print("3. Resolver con A* y mostrar animación en consola.")
-    option = input("Elige una opción (1/2/3): ")
+    print("4. Resolver con estados empaquetados (modo rápido).")
+    print("5. Resolver con la tabla de distancias precalculada (solo 3x3).")
+    print("6. Resolver con IDA* (memoria lineal, recomendado para 4x4 y 5x5).")
+    print("7. Resolver con IDA* y bases de patrones aditivas (hasta 4x4 se construyen la primera vez).")
+    print("8. Resolver con búsqueda bidireccional (BFS desde ambos extremos).")
+    print("9. Resolver con A* vectorizado (expande bloques de nodos con NumPy).")
+    option = input("Elige una opción (1/2/3/4/5/6/7/8/9): ")
 
     if option == '1':
         heuristic = hamming
@@ -165,16 +284,72 @@ def main():
         heuristic = manhattan
         print("\nResolviendo con Manhattan...")
     elif option == '3':
-        heuristic_choice = input("Elige la heurística para A* (1 para Hamming, 2 para Manhattan): ")
-        heuristic = hamming if heuristic_choice == '1' else manhattan
+        heuristic = choose_heuristic(goal_state)
         print("\nResolviendo con A* y mostrando animación en consola...")
+    elif option == '4':
+        heuristic = choose_heuristic(goal_state)
+        print("\nResolviendo con estados empaquetados...")
+    elif option == '5':
+        heuristic = None
+        if size != 3:
+            print("La tabla de distancias solo existe para el 8-puzzle.")
+            return
+        print("\nResolviendo con la tabla de distancias (se construye la primera vez)...")
+    elif option == '6':
+        heuristic = choose_heuristic(goal_state)
+        print("\nResolviendo con IDA*...")
+    elif option == '7':
+        try:
+            heuristic = get_heuristic('pdb', goal_state)
+        except ValueError as error:
+            print(error)
+            return
+        print("\nResolviendo con IDA* y bases de patrones...")
+    elif option == '8':
+        heuristic = None
+        print("\nResolviendo con búsqueda bidireccional...")
+    elif option == '9':
+        heuristic = choose_heuristic(goal_state)
+        print("\nResolviendo con A* vectorizado...")
     else:
         print("Opción inválida.")
         return
 
-    # Ejecutar A* y mostrar el resultado
-    came_from, cost_so_far = a_star(initial_state, goal_state, heuristic)
-    path = reconstruct_path(came_from, initial_state, goal_state)
+    # Ejecutar A* y mostrar el resultado (con un límite de tiempo para que un
+    # tablero difícil no deje el programa colgado)
+    stats = SolveStats()
+    budget = Budget(time_limit=TIME_LIMIT)
+    try:
+        if option == '4':
+            path = solve_packed(initial_state, goal_state, heuristic, stats, budget=budget)
+        elif option == '5':
+            stats = None
+            path = solve_with_oracle(initial_state, goal_state)
+        elif option in ('6', '7'):
+            came_from, cost_so_far = ida_star(initial_state, goal_state, heuristic, stats, budget)
+            path = reconstruct_path(came_from, initial_state, goal_state)
+        elif option == '8':
+            came_from, cost_so_far = bidirectional_search(initial_state, goal_state, stats=stats, budget=budget)
+            path = reconstruct_path(came_from, initial_state, goal_state)
+        elif option == '9':
+            came_from, cost_so_far = a_star_vectorized(initial_state, goal_state, heuristic, stats=stats,
+                                                       budget=budget)
+            path = reconstruct_path(came_from, initial_state, goal_state)
+        else:
+            came_from, cost_so_far = a_star(initial_state, goal_state, heuristic, stats=stats, budget=budget)
+            path = reconstruct_path(came_from, initial_state, goal_state)
+    except BudgetExceeded as exceeded:
+        print(f"\nSe alcanzó el límite de {TIME_LIMIT} s sin terminar la búsqueda ({exceeded.reason}).")
+        partial = exceeded.partial
+        if partial.get('lower_bound') is not None:
+            print(f"La solución óptima tiene al menos {partial['lower_bound']} movimientos.")
+        if partial.get('moves') is not None:
+            print(f"Mejor avance: {partial['moves'] or '(ninguno)'} (h = {partial['best_h']})")
+        path = []
+
+    if stats is not None:
+        print(f"\nNodos expandidos: {stats.nodes_expanded}, generados: {stats.nodes_generated}, "
+              f"frontera máxima: {stats.max_frontier}, tiempo: {stats.wall_time:.3f} s")
 
     if path:
         print("\nSolución encontrada:")
@@ -190,6 +365,13 @@ def main():
     else:
         print("\nNo se pudo encontrar una solución para el puzzle dado.")
 
-# Ejecutar el programa principal
+# Ejecutar el programa principal; con argumentos (p. ej. un archivo de
+# tableros o "-" para stdin) se usa el modo no interactivo de PuzzletCLI
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        # PuzzletCLI trae el lote en paralelo y todos los motores: solo se
+        # importa cuando se usa
+        import PuzzletCLI
+        PuzzletCLI.main()
+    else:
+        main()
@@ -2,9 +2,6 @@ import heapq
 import numpy as np
 import time
 import os
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Button
 
 # Heurísticas: Hamming y Manhattan
 def hamming(state, goal):
@@ -18,6 +15,26 @@ def manhattan(state, goal):
         dist += abs(ix - gx) + abs(iy - gy)
     return dist[0]
 
+# Verifica si un estado puede llegar al objetivo (paridad de inversiones).
+# Con ancho par se suma la fila del espacio vacío.
+def is_solvable(state, goal):
+    tiles = [int(t) for t in np.asarray(state).ravel()]
+    goal_tiles = [int(t) for t in np.asarray(goal).ravel()]
+    if sorted(tiles) != sorted(goal_tiles):
+        return False
+
+    def parity(values):
+        values_no_blank = [t for t in values if t != 0]
+        inversions = sum(1 for i in range(len(values_no_blank))
+                         for j in range(i + 1, len(values_no_blank))
+                         if values_no_blank[i] > values_no_blank[j])
+        size = int(round(len(values) ** 0.5))
+        if size % 2 == 0:
+            inversions += values.index(0) // size
+        return inversions % 2
+
+    return parity(tiles) == parity(goal_tiles)
+
 # Verifica si un estado es la solución
 def is_goal(state, goal):
     return np.array_equal(state, goal)
@@ -119,8 +136,10 @@ def input_puzzle():
 
     return np.array(puzzle)
 
-# Función para crear el árbol del puzzle (en formato binario)
+# Función para crear el árbol del puzzle (en formato binario). networkx y
+# matplotlib se importan solo al graficar, así resolver no los carga
 def create_puzzle_tree(path):
+    import networkx as nx
     G = nx.DiGraph()
 
     # Crear nodos
@@ -154,6 +173,9 @@ def organize_binary_tree(G, pos):
 
 # Función para graficar el árbol con un layout Spring y mover nodos con el mouse
 def plot_tree(G):
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import Button
     pos = nx.spring_layout(G, seed=42)  # Inicializa el layout
     fig, ax = plt.subplots(figsize=(12, 8))
     nx.draw(G, pos, with_labels=True, node_size=3000, node_color='lightblue', font_size=10, font_weight='bold', arrows=True, ax=ax)
@@ -213,6 +235,11 @@ def main():
                            [4, 5, 6], 
                            [7, 8, 0]])
 
+    # Descartar tableros sin solución antes de buscar
+    if not is_solvable(initial_state, goal_state):
+        print("\nEl puzzle no tiene solución (la paridad de inversiones no coincide con el objetivo).")
+        return
+
     print("\nOpciones:")
     print("1. Resolver con la heurística Hamming.")
     print("2. Resolver con la heurística Manhattan.")
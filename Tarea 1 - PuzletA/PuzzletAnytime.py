@@ -0,0 +1,117 @@
+import heapq
+import time
+from itertools import count
+import numpy as np
+from PuzzletBits import (pack, board_size, standard_goal, expand_packed, packed_heuristic,
+                         reconstruct_packed, path_to_moves)
+from PuzzletHeuristics import get_heuristic
+from PuzzletSolvable import is_solvable
+
+# A* anytime al estilo ARA*: empieza con un peso alto (f = g + weight * h),
+# entrega enseguida una primera solución y va bajando el peso reutilizando
+# la búsqueda anterior. Los nodos que mejoran estando cerrados se guardan
+# como inconsistentes y vuelven a la frontera al cambiar el peso. Es un
+# generador de (camino empaquetado, costo, cota): la cota garantiza que
+# costo <= cota * óptimo. Termina al probar la optimalidad (cota 1), al
+# pasar time_limit segundos o al agotar el Budget opcional.
+def ara_star_packed(start, goal, heuristic, size=3, weight=3.0, step=0.5, time_limit=None, stats=None,
+                    budget=None):
+    h_full, h_update = packed_heuristic(heuristic, size)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    h = {start: h_full(start)}
+    g = {start: 0}
+    came_from = {start: None}
+    counter = count()
+    # Entradas (f, -g, contador, g al insertar, estado); las obsoletas se
+    # descartan al sacarlas
+    frontier = [(weight * h[start], 0, next(counter), 0, start)]
+    closed = set()
+    incons = set()
+    best = None
+
+    while True:
+        # Mejorar el camino mientras algún nodo abierto pueda bajar el costo
+        # de la meta con el peso actual
+        while frontier:
+            f, _, _, g_pushed, state = frontier[0]
+            if g_pushed != g[state] or state in closed:
+                heapq.heappop(frontier)
+                continue
+            if goal in g and g[goal] <= f:
+                break
+            if (deadline is not None and time.perf_counter() > deadline) or \
+                    (budget is not None and budget.charge(len(frontier))):
+                if stats is not None:
+                    stats.finish(best)
+                return
+            heapq.heappop(frontier)
+            closed.add(state)
+
+            h_state = h[state]
+            new_cost = g[state] + 1
+            children = expand_packed(state, size)
+            for direction, tile, blank, child in children:
+                if new_cost < g.get(child, new_cost + 1):
+                    g[child] = new_cost
+                    came_from[child] = direction
+                    if child not in h:
+                        h[child] = h_update(h_state, tile, blank, direction) if h_update else h_full(child)
+                    if child in closed:
+                        incons.add(child)
+                    else:
+                        heapq.heappush(frontier, (new_cost + weight * h[child], -new_cost, next(counter), new_cost, child))
+                elif stats is not None:
+                    stats.duplicates_pruned += 1
+            if stats is not None:
+                stats.nodes_generated += len(children)
+                stats.expanded(len(frontier))
+
+        if goal not in g:
+            if stats is not None:
+                stats.finish()
+            return
+
+        # Cota inferior del óptimo: el menor g + h entre los nodos abiertos
+        # o inconsistentes (sin ellos, la solución ya es óptima)
+        pending = [entry[4] for entry in frontier if entry[3] == g[entry[4]] and entry[4] not in closed]
+        pending.extend(incons)
+        lower = min((g[s] + h[s] for s in pending), default=g[goal])
+        cost = g[goal]
+        bound = 1.0 if cost <= lower else min(weight, cost / lower)
+        if best is None or cost < best or bound == 1.0:
+            best = cost
+            path = reconstruct_packed(came_from, start, goal, size)
+            yield path, len(path) - 1, bound
+        if bound == 1.0 or weight <= 1:
+            if stats is not None:
+                stats.finish(best)
+            return
+
+        # Bajar el peso y reconstruir la frontera con los abiertos y los
+        # inconsistentes; los cerrados se vuelven a poder expandir
+        weight = max(1.0, weight - step)
+        frontier = [(g[s] + weight * h[s], -g[s], next(counter), g[s], s) for s in set(pending)]
+        heapq.heapify(frontier)
+        closed = set()
+        incons = set()
+
+# Función para resolver un tablero (secuencia plana o ndarray) en modo
+# anytime: genera diccionarios con cada solución mejor que la anterior
+def solve_anytime(board, heuristic='manhattan', goal=None, time_limit=None, weight=3.0, step=0.5, stats=None,
+                  budget=None):
+    tiles = tuple(int(t) for t in np.asarray(board).ravel())
+    size = board_size(len(tiles))
+    goal = tuple(goal) if goal is not None else standard_goal(size)
+    if not is_solvable(tiles, goal):
+        return
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic, goal)
+    started = time.perf_counter()
+    for path, length, bound in ara_star_packed(pack(tiles), pack(goal), heuristic, size,
+                                               weight, step, time_limit, stats, budget):
+        yield {'board': tiles, 'moves': path_to_moves(path, size), 'length': length,
+               'bound': bound, 'time': time.perf_counter() - started}
@@ -0,0 +1,263 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+import numpy as np
+from PuzzletBits import (pack, unpack_tiles, board_size, standard_goal, a_star_packed,
+                         reconstruct_packed, path_to_moves)
+from PuzzletSolvable import is_solvable
+from PuzzletHeuristics import get_heuristic
+from PuzzletIDA import ida_star_packed
+from PuzzletBidir import bidirectional_packed
+from PuzzletOracle import get_oracle, solve_oracle
+from PuzzletVector import a_star_vectorized_path
+from PuzzletDense import a_star_dense
+from PuzzletHDA import hda_star_packed
+from PuzzletSMA import sma_star_packed
+from PuzzletStats import SolveStats
+from PuzzletCache import SolutionCache
+from PuzzletBudget import BudgetExceeded, make_budget
+
+# Heurísticas ya construidas en este proceso, por (nombre, objetivo), para no
+# rehacer sus tablas en cada tablero
+_heuristic_cache = {}
+
+def cached_heuristic(name, goal):
+    key = (name, goal)
+    if key not in _heuristic_cache:
+        _heuristic_cache[key] = get_heuristic(name, goal)
+    return _heuristic_cache[key]
+
+# Motores sobre estados empaquetados:
+# (inicio, objetivo, heurística, tamaño, stats, budget=...) -> camino
+def _a_star_path(start, goal, heuristic, size, stats=None, weight=1, budget=None):
+    came_from, _ = a_star_packed(start, goal, heuristic, size, stats=stats, weight=weight, budget=budget)
+    return reconstruct_packed(came_from, start, goal, size) if came_from else None
+
+def _dense_path(start, goal, heuristic, size, stats=None, budget=None):
+    return a_star_dense(start, goal, heuristic, size, stats=stats, budget=budget)
+
+# HDA* usa `workers` procesos (por defecto, uno por CPU)
+def _hda_path(start, goal, heuristic, size, stats=None, budget=None, workers=None):
+    return hda_star_packed(start, goal, heuristic, size, workers, stats=stats, budget=budget)
+
+# SMA* con un tope de max_nodes nodos o max_bytes bytes (por defecto,
+# DEFAULT_MAX_NODES)
+def _sma_path(start, goal, heuristic, size, stats=None, budget=None, max_nodes=None, max_bytes=None):
+    return sma_star_packed(start, goal, heuristic, size, max_nodes, max_bytes, stats=stats, budget=budget)
+
+def _bidirectional_path(start, goal, heuristic, size, stats=None, budget=None):
+    return bidirectional_packed(start, goal, size, stats, budget=budget)
+
+def _vectorized_path(start, goal, heuristic, size, stats=None, budget=None):
+    return a_star_vectorized_path(unpack_tiles(start, size), unpack_tiles(goal, size), heuristic,
+                                  stats=stats, budget=budget)
+
+# La tabla de distancias responde al instante, así que ignora el presupuesto
+def _oracle_path(start, goal, heuristic, size, stats=None, budget=None):
+    if stats is not None:
+        stats.start()
+    path = solve_oracle(get_oracle(unpack_tiles(goal, size)), start)
+    if stats is not None:
+        stats.nodes_expanded = len(path)
+        stats.finish(len(path) - 1 if path else None)
+    return path
+
+ENGINES = {
+    'a_star': _a_star_path,
+    'ida_star': ida_star_packed,
+    'dense': _dense_path,
+    'hda': _hda_path,
+    'sma': _sma_path,
+    'bidirectional': _bidirectional_path,
+    'oracle': _oracle_path,
+    'vectorized': _vectorized_path,
+}
+
+# Motores que usan la heurística elegida
+HEURISTIC_ENGINES = ('a_star', 'ida_star', 'dense', 'hda', 'sma', 'vectorized')
+
+# Opciones propias de cada motor, que solve_board le pasa como argumentos
+ENGINE_OPTIONS = {
+    'hda': ('workers',),
+    'sma': ('max_nodes', 'max_bytes'),
+}
+
+# Función para validar las opciones de un motor: descarta las que valen None
+# y exige que las demás sean propias del motor y enteros positivos
+def check_options(engine, options):
+    options = {name: value for name, value in (options or {}).items() if value is not None}
+    for name, value in options.items():
+        if name not in ENGINE_OPTIONS.get(engine, ()):
+            raise ValueError(f"El motor {engine} no acepta la opción {name}.")
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"La opción {name} debe ser un entero positivo.")
+    return options
+
+# Función para leer un tablero escrito como "123405678" (una cifra por
+# casilla), como números separados por espacios o comas, o como JSON (lista
+# plana o lista de filas). Comprueba que sea una permutación de 0..n-1.
+def parse_board(value):
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            value = json.loads(text)
+        elif text.isdigit():
+            value = [int(c) for c in text]
+        else:
+            value = [int(t) for t in text.replace(',', ' ').split()]
+    tiles = tuple(int(t) for t in np.asarray(value).ravel())
+    size = board_size(len(tiles))
+    if size * size != len(tiles) or sorted(tiles) != list(range(len(tiles))):
+        raise ValueError(f"Tablero inválido: {value!r}")
+    return tiles
+
+# Función para resolver un tablero (secuencia plana o ndarray) y devolver un
+# diccionario con el resultado. Con stats=True (o un SolveStats) se añaden
+# las estadísticas de la búsqueda en result['stats']. Con una SolutionCache,
+# primero se busca ahí y cada solución nueva se guarda con sus sufijos.
+# weight > 1 (solo con a_star) usa A* ponderado: la solución ya no es
+# necesariamente óptima y por eso no se guarda en la caché. Con budget (un
+# Budget o un diccionario con sus argumentos), si se agota el resultado
+# tiene status 'budget_exceeded', el motivo y el progreso parcial. options
+# es un diccionario con las opciones del motor (ver ENGINE_OPTIONS).
+def solve_board(board, engine='a_star', heuristic='manhattan', goal=None, stats=None, cache=None,
+                weight=1, budget=None, options=None):
+    options = check_options(engine, options)
+    tiles = tuple(int(t) for t in np.asarray(board).ravel())
+    size = board_size(len(tiles))
+    goal = tuple(goal) if goal is not None else standard_goal(size)
+    result = {'board': tiles, 'solvable': is_solvable(tiles, goal), 'status': 'solved',
+              'moves': None, 'length': None}
+    if not result['solvable']:
+        result['status'] = 'unsolvable'
+        return result
+
+    if weight != 1 and engine != 'a_star':
+        raise ValueError("weight solo se puede usar con el motor a_star.")
+    if weight != 1:
+        cache = None
+    start, packed_goal = pack(tiles), pack(goal)
+    if cache is not None:
+        moves = cache.get(start, packed_goal, size)
+        if moves is not None:
+            result['moves'], result['length'], result['cached'] = moves, len(moves), True
+            return result
+
+    stats = SolveStats() if stats is True else (stats or None)
+    budget = make_budget(budget)
+    h = cached_heuristic(heuristic, goal) if engine in HEURISTIC_ENGINES else None
+    try:
+        if weight != 1:
+            path = _a_star_path(start, packed_goal, h, size, stats, weight, budget)
+        else:
+            path = ENGINES[engine](start, packed_goal, h, size, stats, budget=budget, **options)
+    except BudgetExceeded as exceeded:
+        path = None
+        result['status'], result['reason'], result['partial'] = 'budget_exceeded', exceeded.reason, exceeded.partial
+    if path:
+        result['moves'] = path_to_moves(path, size)
+        result['length'] = len(path) - 1
+        if cache is not None:
+            cache.put_path(path, result['moves'], packed_goal, size)
+    if stats:
+        result['stats'] = stats.as_dict()
+    return result
+
+# Caché de soluciones de este proceso (cada trabajador tiene la suya)
+_worker_cache = None
+
+def worker_cache(maxsize):
+    global _worker_cache
+    if _worker_cache is None or _worker_cache.maxsize != maxsize:
+        _worker_cache = SolutionCache(maxsize)
+    return _worker_cache
+
+# Igual que solve_board, pero un tablero que el motor o la heurística no
+# admiten (ValueError, p. ej. un 4x4 con dense) da un resultado con status
+# 'error' en vez de cortar todo el lote. Un tablero None (p. ej. una línea
+# inválida de la entrada) tampoco se resuelve, pero así conserva su lugar
+# en el orden.
+def try_solve_board(board, engine='a_star', heuristic='manhattan', goal=None, stats=None, cache=None,
+                    weight=1, budget=None, options=None):
+    if board is None:
+        return {'board': None, 'status': 'error'}
+    try:
+        return solve_board(board, engine, heuristic, goal, stats, cache, weight, budget, options)
+    except ValueError as error:
+        return {'board': tuple(int(t) for t in np.asarray(board).ravel()), 'status': 'error',
+                'error': str(error)}
+
+# Tarea de un proceso: resuelve un bloque de tableros numerados
+def _solve_chunk(chunk, engine, heuristic, goal, stats, cache_size=0, weight=1, budget=None, options=None):
+    cache = worker_cache(cache_size) if cache_size else None
+    results = []
+    for index, board in chunk:
+        result = try_solve_board(board, engine, heuristic, goal, stats, cache, weight, budget, options)
+        result['index'] = index
+        results.append(result)
+    return results
+
+# Procesos de HDA* que le tocan a cada uno de `workers` procesos de un pool
+def hda_share(workers):
+    return max(1, (os.cpu_count() or 1) // workers)
+
+# Resuelve muchos tableros repartiendo bloques en un ProcessPoolExecutor.
+# Los resultados se entregan a medida que terminan (ordered=False) o en el
+# orden de entrada (ordered=True). Solo hay unos pocos bloques en vuelo a la
+# vez, así que la entrada puede ser un iterable de cualquier tamaño. Con
+# cache_size > 0 cada trabajador guarda una SolutionCache de ese tamaño.
+# budget es un diccionario con los argumentos de Budget y se aplica a cada
+# tablero por separado. Con el motor hda, si options no fija sus procesos,
+# cada trabajador usa su parte de las CPU para no lanzar workers * CPU procesos.
+def solve_many(boards, workers=None, engine='a_star', heuristic='manhattan', goal=None, chunksize=64,
+               ordered=False, stats=False, cache_size=0, weight=1, budget=None, options=None):
+    workers = workers or os.cpu_count() or 1
+    options = check_options(engine, options)
+    if engine == 'hda' and 'workers' not in options:
+        options['workers'] = hda_share(workers)
+    numbered = enumerate(boards)
+    pending = {}
+    done_chunks = {}
+    next_chunk = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit(chunk_number):
+            chunk = list(islice(numbered, chunksize))
+            if not chunk:
+                return False
+            future = executor.submit(_solve_chunk, chunk, engine, heuristic, goal, stats, cache_size, weight,
+                                     budget, options)
+            pending[future] = chunk_number
+            return True
+
+        # Mantiene a lo sumo 2 * workers bloques entre el primero sin
+        # entregar y el último enviado; en modo ordenado esto también acota
+        # los bloques terminados que esperan a uno anterior más lento
+        submitted = 0
+        exhausted = False
+
+        def top_up():
+            nonlocal submitted, exhausted
+            while not exhausted and submitted - next_chunk < 2 * workers:
+                if not submit(submitted):
+                    exhausted = True
+                    return
+                submitted += 1
+
+        top_up()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_number = pending.pop(future)
+                if ordered:
+                    done_chunks[chunk_number] = future.result()
+                else:
+                    yield from future.result()
+                    next_chunk += 1
+
+            # En modo ordenado se entregan los bloques consecutivos ya listos
+            while ordered and next_chunk in done_chunks:
+                yield from done_chunks.pop(next_chunk)
+                next_chunk += 1
+            top_up()
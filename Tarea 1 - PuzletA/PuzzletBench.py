@@ -0,0 +1,207 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from PuzzletBits import pack, unpack_tiles, apply_move, move_table, blank_index, standard_goal
+from PuzzletBatch import solve_board, ENGINES, HEURISTIC_ENGINES  # los demás motores se miden una sola vez
+from PuzzletHeuristics import HEURISTICS
+from PuzzletOracle import get_oracle, oracle_distance
+from PuzzletStats import SolveStats
+
+# Los dos únicos tableros del 8-puzzle que necesitan 31 movimientos (el
+# máximo) para llegar al objetivo estándar 1..8 con el vacío al final
+HARDEST_3X3 = [
+    (8, 6, 7, 2, 5, 4, 3, 0, 1),
+    (6, 4, 7, 8, 5, 0, 3, 2, 1),
+]
+
+DEFAULT_SEED = 2020
+DEFAULT_DEPTHS = (4, 8, 12, 16, 20, 24)
+DEFAULT_BASELINE = 'bench_baseline.json'
+
+# Heurísticas medidas por defecto. Hamming queda fuera porque IDA* con
+# Hamming tarda más de medio minuto en los tableros de 31 movimientos; se
+# puede pedir explícitamente con --heuristics.
+DEFAULT_HEURISTICS = ('manhattan', 'linear_conflict', 'walking_distance', 'pdb')
+
+# Función para generar un tablero con un paseo aleatorio de `depth`
+# movimientos desde el objetivo, sin deshacer el movimiento anterior
+def random_walk(rng, depth, size=3):
+    state = pack(standard_goal(size))
+    table = move_table(size)
+    previous = None
+    for _ in range(depth):
+        options = [entry[0] for entry in table[blank_index(state, size)]
+                   if previous is None or entry[0] != previous ^ 1]
+        direction = rng.choice(options)
+        state = apply_move(state, direction, size)
+        previous = direction
+    return unpack_tiles(state, size)
+
+# Función para construir el corpus fijo: `per_depth` paseos por profundidad
+# más los tableros de 31 movimientos. Cada caso lleva su distancia óptima
+# (según el oráculo) para comprobar que los motores no pierden optimalidad.
+def build_corpus(seed=DEFAULT_SEED, depths=DEFAULT_DEPTHS, per_depth=5):
+    rng = random.Random(seed)
+    table = get_oracle()
+    corpus = []
+    for depth in depths:
+        for i in range(per_depth):
+            board = random_walk(rng, depth)
+            corpus.append({'name': f'walk{depth}_{i}', 'board': board,
+                           'optimal': oracle_distance(table, pack(board))})
+    for i, board in enumerate(HARDEST_3X3):
+        corpus.append({'name': f'hardest31_{i}', 'board': board,
+                       'optimal': oracle_distance(table, pack(board))})
+    return corpus
+
+# Motores medidos por defecto. HDA* queda fuera: en el 8-puzzle solo mide el
+# costo de lanzar procesos y sus expansiones varían de una corrida a otra.
+DEFAULT_ENGINES = tuple(engine for engine in ENGINES if engine != 'hda')
+
+# Combinaciones (motor, heurística) a medir
+def combinations(engines=None, heuristics=None):
+    engines = engines or list(DEFAULT_ENGINES)
+    heuristics = heuristics or list(DEFAULT_HEURISTICS)
+    combos = []
+    for engine in engines:
+        if engine in HEURISTIC_ENGINES:
+            combos.extend((engine, heuristic) for heuristic in heuristics)
+        else:
+            combos.append((engine, None))
+    return combos
+
+# Función para medir una combinación sobre todo el corpus. El tiempo es el
+# mejor de `repeat` corridas; la memoria pico se mide aparte, en una corrida
+# con tracemalloc, para no inflar los tiempos.
+def run_combo(corpus, engine, heuristic, repeat=3, memory=True):
+    # Calentar tablas (heurísticas, oráculo) fuera de la medición
+    solve_board(corpus[0]['board'], engine, heuristic or 'manhattan')
+
+    cases = []
+    for case in corpus:
+        best_time = None
+        for _ in range(repeat):
+            stats = SolveStats()
+            result = solve_board(case['board'], engine, heuristic or 'manhattan', stats=stats)
+            if best_time is None or stats.wall_time < best_time:
+                best_time = stats.wall_time
+        peak = None
+        if memory:
+            traced = SolveStats(track_memory=True)
+            solve_board(case['board'], engine, heuristic or 'manhattan', stats=traced)
+            peak = traced.peak_memory
+        cases.append({
+            'name': case['name'],
+            'length': result['length'],
+            'optimal': result['length'] == case['optimal'],
+            'time': best_time,
+            'expanded': stats.nodes_expanded,
+            'generated': stats.nodes_generated,
+            'max_frontier': stats.max_frontier,
+            'peak_memory': peak,
+        })
+
+    return {
+        'engine': engine,
+        'heuristic': heuristic,
+        'time': sum(c['time'] for c in cases),
+        'expanded': sum(c['expanded'] for c in cases),
+        'peak_memory': max((c['peak_memory'] or 0) for c in cases) if memory else None,
+        'all_optimal': all(c['optimal'] for c in cases),
+        'cases': cases,
+    }
+
+def combo_key(entry):
+    return f"{entry['engine']}/{entry['heuristic'] or '-'}"
+
+# Función para ejecutar el benchmark completo y devolver un informe JSON
+def run_benchmark(engines=None, heuristics=None, seed=DEFAULT_SEED, depths=DEFAULT_DEPTHS,
+                  per_depth=5, repeat=3, memory=True, verbose=False):
+    corpus = build_corpus(seed, depths, per_depth)
+    results = []
+    for engine, heuristic in combinations(engines, heuristics):
+        entry = run_combo(corpus, engine, heuristic, repeat, memory)
+        if verbose:
+            print(f"{combo_key(entry):32} {entry['time']:8.3f} s {entry['expanded']:10} nodos",
+                  file=sys.stderr)
+        results.append(entry)
+    return {
+        'seed': seed,
+        'depths': list(depths),
+        'per_depth': per_depth,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }
+
+# Función para comparar un informe con una línea base. Las expansiones son
+# deterministas, así que cualquier aumento es una regresión. El tiempo y la
+# memoria dependen de la máquina donde se grabó la línea base, así que solo
+# se comparan si se pide una tolerancia relativa (p. ej. 0.25).
+def compare(report, baseline, tolerance=None):
+    for field in ('seed', 'depths', 'per_depth'):
+        if report[field] != baseline[field]:
+            raise ValueError(f"La línea base usa otro corpus ({field}: {baseline[field]} != {report[field]}).")
+    previous = {combo_key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in report['results']:
+        key = combo_key(entry)
+        if not entry['all_optimal']:
+            regressions.append({'combo': key, 'metric': 'optimal', 'baseline': True, 'current': False})
+        old = previous.get(key)
+        if old is None:
+            continue
+        if entry['expanded'] > old['expanded']:
+            regressions.append({'combo': key, 'metric': 'expanded',
+                                'baseline': old['expanded'], 'current': entry['expanded']})
+        if tolerance is None:
+            continue
+        for metric in ('time', 'peak_memory'):
+            if entry[metric] and old.get(metric) and entry[metric] > old[metric] * (1 + tolerance):
+                regressions.append({'combo': key, 'metric': metric,
+                                    'baseline': old[metric], 'current': entry[metric]})
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de motores y heurísticas del 8-puzzle")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES))
+    parser.add_argument('--heuristics', nargs='+', choices=list(HEURISTICS))
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--depths', type=int, nargs='+', default=list(DEFAULT_DEPTHS))
+    parser.add_argument('--per-depth', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="no medir la memoria pico")
+    parser.add_argument('--output', help="archivo JSON para el informe (por defecto, stdout)")
+    parser.add_argument('--baseline', help=f"línea base con la que comparar (p. ej. {DEFAULT_BASELINE})")
+    parser.add_argument('--save-baseline', help="guardar el informe como nueva línea base")
+    parser.add_argument('--tolerance', type=float,
+                        help="comparar también tiempo y memoria con esta tolerancia relativa (p. ej. 0.25); "
+                             "solo tiene sentido con una línea base grabada en esta máquina")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.engines, args.heuristics, args.seed, args.depths, args.per_depth,
+                           args.repeat, not args.no_memory, verbose=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(report, json.load(f), args.tolerance)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(text + '\n')
+
+    if report.get('regressions'):
+        for regression in report['regressions']:
+            print(f"REGRESIÓN {regression['combo']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,134 @@
+import numpy as np
+from PuzzletBits import pack, unpack_tiles, neighbors_packed, board_size, path_to_came_from
+from PuzzletSolvable import is_solvable
+from PuzzletSymmetry import get_symmetry
+
+# Búsqueda bidireccional (encuentro en el medio) con BFS por capas desde el
+# inicio y desde el objetivo. Como todos los movimientos cuestan 1, basta con
+# terminar la capa en la que las fronteras se tocan y quedarse con el mejor
+# punto de encuentro de esa capa para que el camino sea óptimo.
+# Con symmetric=True el lado del objetivo (que es su propia imagen por las
+# simetrías del objetivo) solo guarda representantes canónicos: un estado y
+# su imagen están a la misma distancia del objetivo. Ese lado ocupa la mitad
+# de memoria, pero calcular los canónicos en Python lo hace unas 2-3 veces
+# más lento, así que está desactivado por defecto.
+# Con un Budget, al agotarlo lanza BudgetExceeded: como las capas ya
+# terminadas no se tocaron, la suma de sus profundidades + 1 es cota inferior.
+# Un tablero sin solución devuelve None sin recorrer todo el espacio.
+def bidirectional_packed(start, goal, size=3, stats=None, symmetric=False, budget=None):
+    if not is_solvable(unpack_tiles(start, size), unpack_tiles(goal, size)):
+        return None
+    symmetry = get_symmetry(unpack_tiles(goal, size)) if symmetric else None
+    if symmetry is not None and len(symmetry) == 1:
+        symmetry = None
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    if start == goal:
+        if stats is not None:
+            stats.finish(0)
+        return [start]
+
+    # parents[lado]: estado -> padre; depth[lado]: estado -> profundidad
+    parents = ({start: None}, {goal: None})
+    depth = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    layers = [0, 0]
+
+    while frontiers[0] and frontiers[1]:
+        # Expandir siempre la frontera más pequeña
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_parents, own_depth = parents[side], depth[side]
+        other_depth = depth[1 - side]
+        next_frontier = []
+        best, meeting = None, None
+
+        for state in frontiers[side]:
+            new_depth = own_depth[state] + 1
+            children = neighbors_packed(state, size)
+            if stats is not None:
+                stats.nodes_generated += len(children)
+                stats.expanded(len(frontiers[0]) + len(frontiers[1]) + len(next_frontier))
+            if budget is not None and budget.charge(len(frontiers[0]) + len(frontiers[1]) + len(next_frontier)):
+                if stats is not None:
+                    stats.finish()
+                raise budget.exceeded(lower_bound=layers[0] + layers[1] + 1)
+            for neighbor in children:
+                if side == 1 and symmetry is not None:
+                    neighbor = symmetry.canonical(neighbor)[0]
+                if neighbor in own_parents:
+                    if stats is not None:
+                        stats.duplicates_pruned += 1
+                    continue
+                own_parents[neighbor] = state
+                own_depth[neighbor] = new_depth
+                next_frontier.append(neighbor)
+                # Parejas (estado del lado del inicio, clave del lado del
+                # objetivo) que pueden unir las dos búsquedas
+                if symmetry is None:
+                    pairs = ((neighbor, neighbor),)
+                elif side == 0:
+                    pairs = ((neighbor, symmetry.canonical(neighbor)[0]),)
+                else:
+                    pairs = ((image, neighbor) for image in symmetry.images(neighbor))
+                for forward, backward in pairs:
+                    if forward in depth[0] and backward in depth[1]:
+                        total = depth[0][forward] + depth[1][backward]
+                        if best is None or total < best:
+                            best, meeting = total, forward
+
+        if meeting is not None:
+            if stats is not None:
+                stats.finish(best)
+            if symmetry is not None:
+                return trace(parents[0], meeting) + descend(meeting, depth[1], symmetry, size)
+            return join_paths(parents, meeting)
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        layers[side] += 1
+
+    if stats is not None:
+        stats.finish()
+    return None
+
+# Función para obtener el camino desde la raíz de un lado hasta state
+def trace(parents, state):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
+
+# Función para unir las dos mitades del camino en el punto de encuentro
+def join_paths(parents, meeting):
+    forward = trace(parents[0], meeting)
+
+    current = parents[1][meeting]
+    while current is not None:
+        forward.append(current)
+        current = parents[1][current]
+    return forward
+
+# Función para completar el camino desde el punto de encuentro hasta el
+# objetivo cuando el lado del objetivo guarda estados canónicos: en cada paso
+# se elige un vecino cuyo representante está una capa más cerca
+def descend(state, depth, symmetry, size=3):
+    path = []
+    remaining = depth[symmetry.canonical(state)[0]]
+    while remaining > 0:
+        for neighbor in neighbors_packed(state, size):
+            if depth.get(symmetry.canonical(neighbor)[0]) == remaining - 1:
+                state, remaining = neighbor, remaining - 1
+                path.append(state)
+                break
+    return path
+
+# Búsqueda bidireccional con la misma forma de llamada que a_star; la
+# heurística se ignora porque el BFS no la necesita. Devuelve
+# (came_from, cost_so_far) compatible con reconstruct_path.
+def bidirectional_search(initial_state, goal_state, heuristic=None, stats=None, budget=None):
+    initial_state = np.asarray(initial_state)
+    size = board_size(initial_state.size)
+    path = bidirectional_packed(pack(initial_state), pack(goal_state), size, stats, budget=budget)
+    return path_to_came_from(path, size, initial_state.dtype)
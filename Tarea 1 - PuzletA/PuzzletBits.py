@@ -0,0 +1,255 @@
+import numpy as np
+from PuzzletSolvable import is_solvable
+from PuzzletHeuristics import get_heuristic
+from PuzzletQueue import QUEUES, TIE_BREAKS
+from PuzzletStats import timed
+
+# Representación empaquetada: cada ficha ocupa 4 bits (5 a partir del
+# 24-puzzle) y el índice del espacio vacío se guarda en los bits superiores,
+# así un estado es un único int.
+BITS = 4
+
+# Función para obtener los bits por ficha de un tablero size x size
+def tile_bits(size=3):
+    return max(BITS, (size * size - 1).bit_length())
+
+# Función para obtener el tamaño del tablero a partir del número de celdas
+def board_size(cells):
+    return int(round(cells ** 0.5))
+
+# Función para obtener el objetivo estándar (1..n-1 y el vacío al final)
+def standard_goal(size=3):
+    return tuple(range(1, size * size)) + (0,)
+
+# Movimientos del espacio vacío (mismo orden que en neighbors)
+DIRECTIONS = [(-1, 0, 'U'), (1, 0, 'D'), (0, -1, 'L'), (0, 1, 'R')]
+
+_move_tables = {}
+
+# Función para construir la tabla de movimientos de un tablero size x size.
+# Para cada posición del vacío guarda (dirección, destino, desplazamiento del
+# destino, desplazamiento del vacío, xor del índice del vacío).
+def move_table(size=3):
+    if size in _move_tables:
+        return _move_tables[size]
+    bits = tile_bits(size)
+    blank_shift = bits * size * size
+    table = []
+    for pos in range(size * size):
+        x, y = divmod(pos, size)
+        moves = []
+        for direction, (dx, dy, _) in enumerate(DIRECTIONS):
+            new_x, new_y = x + dx, y + dy
+            if 0 <= new_x < size and 0 <= new_y < size:
+                new_pos = new_x * size + new_y
+                moves.append((direction, new_pos, bits * new_pos, bits * pos, (pos ^ new_pos) << blank_shift))
+        table.append(tuple(moves))
+    _move_tables[size] = tuple(table)
+    return _move_tables[size]
+
+# Función para aplicar un movimiento del vacío (código 0..3) a un estado
+def apply_move(packed, direction, size=3):
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    for move, _, shift_new, shift_blank, blank_xor in move_table(size)[packed >> (bits * size * size)]:
+        if move == direction:
+            tile = (packed >> shift_new) & mask
+            return packed ^ (tile << shift_new) ^ (tile << shift_blank) ^ blank_xor
+    raise ValueError(f"Movimiento {DIRECTIONS[direction][2]} fuera del tablero.")
+
+# Función para empaquetar un tablero (ndarray o secuencia plana) en un int
+def pack(state):
+    tiles = [int(t) for t in np.asarray(state).ravel()]
+    bits = tile_bits(board_size(len(tiles)))
+    packed = 0
+    for i, tile in enumerate(tiles):
+        packed |= tile << (bits * i)
+    return packed | (tiles.index(0) << (bits * len(tiles)))
+
+# Función para obtener las fichas de un estado empaquetado como tupla plana
+def unpack_tiles(packed, size=3):
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    return tuple((packed >> (bits * i)) & mask for i in range(size * size))
+
+# Función para desempaquetar un estado a un ndarray size x size
+def unpack(packed, size=3, dtype=None):
+    return np.array(unpack_tiles(packed, size), dtype=dtype).reshape((size, size))
+
+# Función para obtener la posición del espacio vacío
+def blank_index(packed, size=3):
+    return packed >> (tile_bits(size) * size * size)
+
+# Encuentra los vecinos de un estado empaquetado usando la tabla de movimientos
+def neighbors_packed(packed, size=3):
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    result = []
+    for _, _, shift_new, shift_blank, blank_xor in move_table(size)[packed >> (bits * size * size)]:
+        tile = (packed >> shift_new) & mask
+        result.append(packed ^ (tile << shift_new) ^ (tile << shift_blank) ^ blank_xor)
+    return result
+
+# Igual que neighbors_packed pero indica también la dirección del vacío, la
+# ficha movida y la posición del vacío (lo necesario para actualizar h)
+def expand_packed(packed, size=3):
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    blank = packed >> (bits * size * size)
+    result = []
+    for direction, _, shift_new, shift_blank, blank_xor in move_table(size)[blank]:
+        tile = (packed >> shift_new) & mask
+        result.append((direction, tile, blank, packed ^ (tile << shift_new) ^ (tile << shift_blank) ^ blank_xor))
+    return result
+
+# Función para adaptar una heurística al formato empaquetado: las que tienen
+# evaluate() reciben la tupla de fichas y, si además tienen update() (como
+# Manhattan), se actualizan en O(1) por movimiento; las funciones simples
+# reciben directamente el int empaquetado.
+def packed_heuristic(heuristic, size=3):
+    if hasattr(heuristic, 'evaluate'):
+        def h_full(packed):
+            return heuristic.evaluate(unpack_tiles(packed, size))
+        return h_full, getattr(heuristic, 'update', None)
+    return heuristic, None
+
+# Algoritmo A* sobre estados empaquetados: las claves de los diccionarios son
+# ints y los vecinos se generan con desplazamientos de bits, sin NumPy.
+# came_from guarda solo el código del movimiento (0..3) que llevó a cada
+# estado, no el estado padre. La frontera es una cola indexada con
+# decrease-key (de cubetas o binaria) y los estados expandidos pasan al
+# conjunto cerrado; tie_break elige qué nodo sale primero a igual f.
+# Si se pasa un SolveStats, se llena durante la búsqueda. Con weight > 1 es A*
+# ponderado (f = g + weight * h): con una heurística consistente y sin reabrir
+# nodos cerrados, la solución cuesta como mucho weight veces la óptima.
+# Con un Budget, al agotarlo lanza BudgetExceeded con el mejor estado
+# alcanzado (menor h), los movimientos hasta él y la cota inferior.
+def a_star_packed(start, goal, heuristic, size=3, tie_break='high_g', queue='bucket', stats=None, weight=1,
+                  budget=None):
+    h_full, h_update = packed_heuristic(heuristic, size)
+    h_full = timed(h_full, stats, 'heuristic_time')
+    h_update = timed(h_update, stats, 'heuristic_time')
+    priority = TIE_BREAKS[tie_break]
+    pq = QUEUES[queue]()
+    push = timed(pq.push, stats, 'queue_time')
+    pop = timed(pq.pop, stats, 'queue_time')
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    h_so_far = {start: h_full(start)}
+    push(start, priority(weight * h_so_far[start], 0, h_so_far[start]))
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+    closed = set()
+    generated = pruned = 0
+    best = start
+
+    while pq:
+        (f, _), current = pop()
+
+        if current == goal:
+            if stats is not None:
+                stats.nodes_generated, stats.duplicates_pruned = generated, pruned
+                stats.finish(cost_so_far[current])
+            return came_from, cost_so_far
+        closed.add(current)
+
+        h = h_so_far[current]
+        new_cost = cost_so_far[current] + 1
+        children = expand_packed(current, size)
+        generated += len(children)
+        for direction, tile, blank, neighbor in children:
+            if neighbor in closed:
+                pruned += 1
+                continue
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                if neighbor not in h_so_far:
+                    h_so_far[neighbor] = h_update(h, tile, blank, direction) if h_update else h_full(neighbor)
+                h_neighbor = h_so_far[neighbor]
+                push(neighbor, priority(new_cost + weight * h_neighbor, new_cost, h_neighbor))
+                came_from[neighbor] = direction
+            else:
+                pruned += 1
+        if stats is not None:
+            stats.nodes_generated, stats.duplicates_pruned = generated, pruned
+            stats.expanded(len(pq))
+        if budget is not None:
+            if h < h_so_far[best]:
+                best = current
+            if budget.charge(len(pq)):
+                if stats is not None:
+                    stats.finish()
+                raise budget.exceeded(lower_bound=f if weight == 1 else None,
+                                      best_state=unpack_tiles(best, size), best_h=h_so_far[best],
+                                      moves=reconstruct_moves(came_from, start, best, size))
+
+    if stats is not None:
+        stats.finish()
+    return None, None
+
+# Función para obtener los códigos de movimiento desde start hasta goal: se
+# retrocede desde goal deshaciendo cada movimiento (la dirección opuesta es
+# direction ^ 1) y se invierte la lista
+def reconstruct_move_codes(came_from, start, goal, size=3):
+    codes = []
+    current = goal
+    while current != start:
+        direction = came_from[current]
+        codes.append(direction)
+        current = apply_move(current, direction ^ 1, size)
+    codes.reverse()
+    return codes
+
+# Función para obtener la solución como cadena de movimientos, p. ej. "ULDR"
+def reconstruct_moves(came_from, start, goal, size=3):
+    if came_from is None:
+        return None
+    return ''.join(DIRECTIONS[d][2] for d in reconstruct_move_codes(came_from, start, goal, size))
+
+# Función para reconstruir el camino de estados empaquetados reproduciendo
+# los movimientos hacia adelante desde start
+def reconstruct_packed(came_from, start, goal, size=3):
+    if came_from is None:
+        return []
+
+    path = [start]
+    for direction in reconstruct_move_codes(came_from, start, goal, size):
+        path.append(apply_move(path[-1], direction, size))
+    return path
+
+# Función para convertir un camino de estados empaquetados en la cadena de
+# movimientos del vacío, por ejemplo "ULDR"
+def path_to_moves(path, size=3):
+    letters = {-size: 'U', size: 'D', -1: 'L', 1: 'R'}
+    blanks = [blank_index(state, size) for state in path]
+    return ''.join(letters[b - a] for a, b in zip(blanks, blanks[1:]))
+
+# Función para convertir un camino de estados empaquetados al formato
+# (came_from, cost_so_far) que espera reconstruct_path, con códigos de
+# movimiento como valores de came_from
+def path_to_came_from(path, size=3, dtype=None):
+    if path is None:
+        return None, None
+    codes = {-size: 0, size: 1, -1: 2, 1: 3}
+    keys = [unpack(state, size, dtype).tobytes() for state in path]
+    came_from = {keys[0]: None}
+    cost_so_far = {keys[0]: 0}
+    for g in range(1, len(path)):
+        came_from[keys[g]] = codes[blank_index(path[g], size) - blank_index(path[g - 1], size)]
+        cost_so_far[keys[g]] = g
+    return came_from, cost_so_far
+
+# Función para resolver con estados empaquetados a partir de ndarrays; la
+# heurística puede ser un nombre del registro o un objeto heurística
+def solve_packed(initial_state, goal_state, heuristic='manhattan', stats=None, weight=1, budget=None):
+    if not is_solvable(initial_state, goal_state):
+        return []
+    size = np.asarray(initial_state).shape[0]
+    start, goal = pack(initial_state), pack(goal_state)
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic, goal_state)
+    came_from, _ = a_star_packed(start, goal, heuristic, size, stats=stats, weight=weight, budget=budget)
+    dtype = np.asarray(initial_state).dtype
+    return [unpack(state, size, dtype) for state in reconstruct_packed(came_from, start, goal, size)]
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from PuzzletStats import process_max_rss
+
+# Señal de cancelación que se puede activar desde otro hilo; los motores la
+# consultan periódicamente a través de su Budget
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+# Excepción que lanza un motor al agotar su presupuesto. reason dice qué
+# límite se alcanzó ('time', 'nodes', 'frontier', 'memory' o 'cancelled') y
+# partial guarda el progreso: cota inferior del óptimo si se conoce, el mejor
+# estado alcanzado (menor h) y los movimientos hasta él.
+class BudgetExceeded(Exception):
+    def __init__(self, reason, partial=None):
+        super().__init__(f"Presupuesto agotado: {reason}")
+        self.reason = reason
+        self.partial = partial or {}
+
+# Función para leer la memoria residente actual del proceso en bytes (en
+# Linux; en otros sistemas, el máximo residente)
+def current_memory():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return process_max_rss() or 0
+
+# Límites de una búsqueda: tiempo (segundos), nodos expandidos, tamaño de la
+# frontera y memoria residente (bytes), más un CancelToken opcional. Los
+# motores llaman a charge() en cada expansión, que devuelve True si se agotó
+# algún límite (y lo deja en reason); los límites baratos se miran siempre y
+# el reloj, la memoria y la cancelación cada check_every nodos.
+class Budget:
+    def __init__(self, time_limit=None, max_expanded=None, max_frontier=None, max_memory=None,
+                 token=None, check_every=256):
+        self.time_limit = time_limit
+        self.max_expanded = max_expanded
+        self.max_frontier = max_frontier
+        self.max_memory = max_memory
+        self.token = token
+        self.check_every = check_every
+        self.expanded = 0
+        self.deadline = None
+        self.reason = None
+
+    def start(self):
+        self.expanded = 0
+        self.reason = None
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        return self
+
+    def charge(self, frontier_size=0):
+        self.expanded += 1
+        if self.max_expanded is not None and self.expanded > self.max_expanded:
+            self.reason = 'nodes'
+        elif self.max_frontier is not None and frontier_size > self.max_frontier:
+            self.reason = 'frontier'
+        elif self.expanded % self.check_every == 0:
+            return self.check()
+        return self.reason is not None
+
+    def check(self):
+        if self.token is not None and self.token.cancelled:
+            self.reason = 'cancelled'
+        elif self.deadline is not None and time.perf_counter() > self.deadline:
+            self.reason = 'time'
+        elif self.max_memory is not None and current_memory() > self.max_memory:
+            self.reason = 'memory'
+        return self.reason is not None
+
+    # Excepción con el progreso parcial de la búsqueda interrumpida
+    def exceeded(self, **partial):
+        partial['expanded'] = self.expanded
+        return BudgetExceeded(self.reason, partial)
+
+# Función para crear el Budget de una búsqueda: acepta un Budget, un
+# diccionario con sus argumentos (útil entre procesos) o None
+def make_budget(budget):
+    if budget is None or isinstance(budget, Budget):
+        return budget
+    return Budget(**budget)
@@ -0,0 +1,128 @@
+import argparse
+import json
+import sys
+from PuzzletBatch import parse_board, try_solve_board, solve_many, check_options, ENGINES
+from PuzzletCache import SolutionCache
+from PuzzletHeuristics import HEURISTICS
+
+# Modo no interactivo: lee un tablero por línea ("123405678", números
+# separados por espacios o comas, una lista JSON o un objeto JSON con "board"
+# y opcionalmente "id") desde un archivo o stdin, y escribe una línea JSON
+# por resultado a medida que termina. Los tableros se leen de a poco y solo
+# hay unos pocos bloques en vuelo, así que la memoria no crece con la entrada.
+
+# Función para leer las líneas de entrada: genera (número de línea, id,
+# tablero) o (número de línea, id, error) para las líneas inválidas
+def read_boards(lines):
+    for number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        identifier = None
+        try:
+            if text.startswith('{'):
+                record = json.loads(text)
+                identifier = record.get('id')
+                text = record['board']
+            yield number, identifier, parse_board(text), None
+        except (ValueError, KeyError, TypeError) as error:
+            yield number, identifier, None, str(error) or repr(error)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Resuelve tableros leídos línea a línea y escribe los resultados en JSONL")
+    parser.add_argument('input', nargs='?', default='-', help="archivo de entrada ('-' para stdin)")
+    parser.add_argument('-o', '--output', default='-', help="archivo de salida ('-' para stdout)")
+    parser.add_argument('-e', '--engine', default='a_star', choices=list(ENGINES))
+    parser.add_argument('-H', '--heuristic', default='manhattan', choices=list(HEURISTICS))
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="procesos en paralelo (1 = en este proceso; 0 = uno por CPU)")
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--unordered', action='store_true',
+                        help="escribir cada resultado en cuanto termina, sin respetar el orden de entrada")
+    parser.add_argument('--goal', help="objetivo, en el mismo formato que los tableros")
+    parser.add_argument('--weight', type=float, default=1, help="peso de A* ponderado (solo con a_star)")
+    parser.add_argument('--time-limit', type=float, help="límite de tiempo por tablero (s)")
+    parser.add_argument('--max-nodes', type=int, help="límite de nodos expandidos por tablero")
+    parser.add_argument('--hda-workers', type=int,
+                        help="procesos de HDA* por tablero (por defecto, las CPU repartidas entre los -j procesos)")
+    parser.add_argument('--sma-max-nodes', type=int, help="nodos que SMA* puede tener en memoria")
+    parser.add_argument('--sma-max-bytes', type=int, help="memoria de SMA* en bytes (si no se da --sma-max-nodes)")
+    parser.add_argument('--cache-size', type=int, default=0, help="tamaño de la caché de soluciones")
+    parser.add_argument('--stats', action='store_true', help="incluir las estadísticas de cada búsqueda")
+    return parser
+
+# Función para convertir un resultado en la línea JSON de salida
+def format_result(result, number, identifier, stats):
+    record = {'line': number}
+    if identifier is not None:
+        record['id'] = identifier
+    for field in ('board', 'solvable', 'status', 'error', 'moves', 'length', 'reason', 'partial', 'cached'):
+        if field in result:
+            record[field] = result[field]
+    if stats and 'stats' in result:
+        record['stats'] = result['stats']
+    return json.dumps(record)
+
+# Opciones propias del motor elegido (ver ENGINE_OPTIONS)
+def engine_options(args):
+    return {'workers': args.hda_workers, 'max_nodes': args.sma_max_nodes, 'max_bytes': args.sma_max_bytes}
+
+def run(args, lines, out):
+    goal = parse_board(args.goal) if args.goal else None
+    budget = None
+    if args.time_limit is not None or args.max_nodes is not None:
+        budget = {'time_limit': args.time_limit, 'max_expanded': args.max_nodes}
+    options = engine_options(args)
+    # Línea, id y error de cada tablero en vuelo, por su índice en la entrada
+    origin = {}
+
+    # Las líneas inválidas pasan como tablero None y vuelven como resultado
+    # con status 'error', así salen en su lugar también en modo ordenado; los
+    # tableros que el motor no admite también vuelven con status 'error'
+    def boards():
+        for index, (number, identifier, board, error) in enumerate(read_boards(lines)):
+            origin[index] = (number, identifier, error)
+            yield board
+
+    if args.workers == 1:
+        cache = SolutionCache(args.cache_size) if args.cache_size else None
+        results = ({**try_solve_board(board, args.engine, args.heuristic, goal, args.stats, cache, args.weight,
+                                      budget, options),
+                    'index': index} for index, board in enumerate(boards()))
+    else:
+        results = solve_many(boards(), args.workers or None, args.engine, args.heuristic, goal, args.chunksize,
+                             not args.unordered, args.stats, args.cache_size, args.weight, budget, options)
+
+    for result in results:
+        number, identifier, error = origin.pop(result['index'])
+        if error is not None:
+            result = {'status': 'error', 'error': error}
+        out.write(format_result(result, number, identifier, args.stats) + '\n')
+        out.flush()
+    out.flush()
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        check_options(args.engine, engine_options(args))
+    except ValueError as error:
+        parser.error(str(error))
+    if args.weight != 1 and args.engine != 'a_star':
+        parser.error("--weight solo se puede usar con el motor a_star.")
+    source = sys.stdin if args.input == '-' else open(args.input)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        run(args, source, out)
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (p. ej. "| head"): terminar sin error
+        sys.stderr.close()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
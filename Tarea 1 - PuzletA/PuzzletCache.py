@@ -0,0 +1,119 @@
+import json
+import os
+from collections import OrderedDict
+from PuzzletBits import unpack_tiles, apply_move
+from PuzzletSymmetry import get_symmetry, LETTERS
+
+FORMAT = 'puzzlet-cache-2'
+# Las cachés del formato 1 no tenían el campo symmetric y guardaban los
+# estados tal cual, así que se leen como symmetric=False
+OLD_FORMATS = ('puzzlet-cache-1',)
+
+# Caché LRU de soluciones: (objetivo, estado) empaquetados -> movimientos
+# óptimos que faltan ("ULDR..."). Al guardar una solución se guardan también
+# todos los estados intermedios del camino con su sufijo, así que una consulta
+# que cae en cualquier punto de un camino conocido es una búsqueda en el
+# diccionario. Con path, la caché se carga al crearla y save() la escribe.
+# Con symmetric=True solo se guarda el representante canónico de cada grupo
+# de tableros simétricos y los movimientos se traducen al consultar.
+class SolutionCache:
+    def __init__(self, maxsize=100000, path=None, symmetric=True):
+        self.maxsize = maxsize
+        self.path = path
+        self.symmetric = symmetric
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def symmetry(self, goal, size):
+        return get_symmetry(unpack_tiles(goal, size)) if self.symmetric else None
+
+    # Devuelve los movimientos que faltan desde state o None si no está
+    def get(self, state, goal, size=3):
+        symmetry = self.symmetry(goal, size)
+        index = 0
+        if symmetry is not None:
+            state, index = symmetry.canonical(state)
+        moves = self.entries.get((goal, state))
+        if moves is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end((goal, state))
+        self.hits += 1
+        return symmetry.unmap_moves(moves, index) if index else moves
+
+    # Guarda una entrada tal cual (state ya debe ser canónico si la caché es
+    # simétrica); para guardar soluciones se usa put_path
+    def put(self, state, goal, moves):
+        key = (goal, state)
+        self.entries[key] = moves
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    # Guarda un camino óptimo de estados empaquetados: cada estado del camino
+    # recibe el sufijo de movimientos que le falta. Se insertan de la meta
+    # hacia el inicio para que, si no caben todos, se conserven los más
+    # cercanos al inicio (los que se consultan directamente).
+    def put_path(self, path, moves, goal, size=3):
+        symmetry = self.symmetry(goal, size)
+        for i in range(len(path) - 1, -1, -1):
+            state, index = symmetry.canonical(path[i]) if symmetry is not None else (path[i], 0)
+            self.put(state, goal, symmetry.map_moves(moves[i:], index) if index else moves[i:])
+
+    # Guarda una solución dada como cadena de movimientos desde start
+    def put_moves(self, start, moves, goal, size=3):
+        path = [start]
+        for move in moves:
+            path.append(apply_move(path[-1], LETTERS.index(move), size))
+        self.put_path(path, moves, goal, size)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    # Escribe la caché en disco (JSON, del menos al más usado) de forma
+    # atómica: primero en un archivo temporal y luego se reemplaza
+    def save(self, path=None):
+        path = path or self.path
+        data = {'format': FORMAT, 'symmetric': self.symmetric,
+                'entries': [[goal, state, moves] for (goal, state), moves in self.entries.items()]}
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(data, f)
+        os.replace(temporary, path)
+
+    def load(self, path=None):
+        path = path or self.path
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('format') != FORMAT and data.get('format') not in OLD_FORMATS:
+            raise ValueError(f"{path} no es una caché de soluciones válida.")
+        if data.get('symmetric', False) != self.symmetric:
+            raise ValueError(f"{path} se guardó con otra opción de simetría.")
+        for goal, state, moves in data['entries']:
+            self.put(state, goal, moves)
+
+    def __repr__(self):
+        return "SolutionCache(" + ", ".join(f"{k}={v!r}" for k, v in self.info().items()) + ")"
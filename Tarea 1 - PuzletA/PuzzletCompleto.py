@@ -2,6 +2,7 @@ import heapq
 import numpy as np
 import time
 import os
+from PuzzletSolvable import is_solvable
 
 # Heurísticas: Hamming y Manhattan
 def hamming(state, goal):
@@ -125,6 +126,11 @@ def main():
                            [4, 5, 6], 
                            [7, 8, 0]])
 
+    # Descartar tableros sin solución antes de buscar
+    if not is_solvable(initial_state, goal_state):
+        print("\nEl puzzle no tiene solución (la paridad de inversiones no coincide con el objetivo).")
+        return
+
     print("\nOpciones:")
     print("1. Resolver con la heurística Hamming.")
     print("2. Resolver con la heurística Manhattan.")
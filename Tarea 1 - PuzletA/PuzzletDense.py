@@ -0,0 +1,107 @@
+from PuzzletBits import expand_packed, packed_heuristic, apply_move, unpack_tiles, path_to_moves
+from PuzzletQueue import QUEUES, TIE_BREAKS
+from PuzzletRank import rank_packed, rank_after_move, state_space_size
+from PuzzletStats import timed
+
+# A* con los datos por estado en arreglos planos indexados por rank_packed,
+# para tableros cuyo espacio completo cabe en memoria (hasta 3x3: 181440
+# estados). En vez de los diccionarios came_from, cost_so_far y h_so_far y
+# del conjunto de cerrados usa:
+#   g      un byte por estado (UNSEEN si no se generó)
+#   h_move un byte por estado: h << 2 | dirección con la que se llegó
+#   closed un bit por estado
+# En total unos 400 KB para el 8-puzzle entero, reservados de una vez.
+UNSEEN = 255
+MAX_STATES = state_space_size(9)
+# La cola guarda un solo int por nodo: el estado empaquetado seguido de su
+# índice en los INDEX_BITS bits bajos
+INDEX_BITS = MAX_STATES.bit_length()
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+# Función para reconstruir el camino de estados empaquetados deshaciendo
+# desde goal las direcciones guardadas en h_move
+def reconstruct_dense(h_move, start, goal, size=3):
+    path = [goal]
+    current, index = goal, rank_packed(goal, size)
+    while current != start:
+        back = (h_move[index] & 3) ^ 1
+        current = apply_move(current, back, size)
+        index = rank_after_move(index, back, current, size)
+        path.append(current)
+    path.reverse()
+    return path
+
+# Algoritmo A* sobre arreglos densos; mismos parámetros y resultados que
+# a_star_packed (la cola y el desempate se eligen igual), pero devuelve
+# directamente el camino de estados empaquetados o None. La heurística debe
+# ser admisible (h < 64 en estos tamaños) y la búsqueda es siempre óptima.
+def a_star_dense(start, goal, heuristic, size=3, tie_break='high_g', queue='bucket', stats=None, budget=None):
+    total = state_space_size(size * size)
+    if total > MAX_STATES:
+        raise ValueError(f"El motor denso solo admite tableros de hasta 3x3 ({size}x{size} tiene {total} estados).")
+    h_full, h_update = packed_heuristic(heuristic, size)
+    h_full = timed(h_full, stats, 'heuristic_time')
+    h_update = timed(h_update, stats, 'heuristic_time')
+    priority = TIE_BREAKS[tie_break]
+    pq = QUEUES[queue]()
+    push = timed(pq.push, stats, 'queue_time')
+    pop = timed(pq.pop, stats, 'queue_time')
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    g = bytearray([UNSEEN]) * total
+    h_move = bytearray(total)
+    closed = bytearray((total + 7) >> 3)
+    start_index, goal_index = rank_packed(start, size), rank_packed(goal, size)
+    h_start = h_full(start)
+    g[start_index] = 0
+    h_move[start_index] = h_start << 2
+    push(start << INDEX_BITS | start_index, priority(h_start, 0, h_start))
+    generated = pruned = 0
+    best, best_h = start, h_start
+
+    while pq:
+        (f, _), item = pop()
+        current, index = item >> INDEX_BITS, item & INDEX_MASK
+
+        if index == goal_index:
+            if stats is not None:
+                stats.nodes_generated, stats.duplicates_pruned = generated, pruned
+                stats.finish(g[index])
+            return reconstruct_dense(h_move, start, goal, size)
+        closed[index >> 3] |= 1 << (index & 7)
+
+        h = h_move[index] >> 2
+        new_cost = g[index] + 1
+        children = expand_packed(current, size)
+        generated += len(children)
+        for direction, tile, blank, neighbor in children:
+            child = rank_after_move(index, direction, neighbor, size)
+            if closed[child >> 3] & (1 << (child & 7)):
+                pruned += 1
+                continue
+            seen = g[child] != UNSEEN
+            if not seen or new_cost < g[child]:
+                g[child] = new_cost
+                h_neighbor = h_move[child] >> 2 if seen else \
+                    (h_update(h, tile, blank, direction) if h_update else h_full(neighbor))
+                h_move[child] = h_neighbor << 2 | direction
+                push(neighbor << INDEX_BITS | child, priority(new_cost + h_neighbor, new_cost, h_neighbor))
+            else:
+                pruned += 1
+        if stats is not None:
+            stats.nodes_generated, stats.duplicates_pruned = generated, pruned
+            stats.expanded(len(pq))
+        if budget is not None:
+            if h < best_h:
+                best, best_h = current, h
+            if budget.charge(len(pq)):
+                if stats is not None:
+                    stats.finish()
+                raise budget.exceeded(lower_bound=f, best_state=unpack_tiles(best, size), best_h=best_h,
+                                      moves=path_to_moves(reconstruct_dense(h_move, start, best, size), size))
+
+    if stats is not None:
+        stats.finish()
+    return None
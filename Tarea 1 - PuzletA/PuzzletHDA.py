@@ -0,0 +1,226 @@
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+from PuzzletBits import expand_packed, packed_heuristic, apply_move
+from PuzzletBudget import make_budget
+
+# A* distribuido por hash al estilo HDA*: cada proceso es dueño de los
+# estados que caen en él según owner() y guarda su propia frontera, g y
+# came_from. Los hijos de otro dueño se acumulan por destino y se envían en
+# lotes por colas de multiprocessing. Como las expansiones no siguen un
+# orden global de f, un estado puede llegar luego con menor g y se reabre.
+# La mejor solución conocida (incumbent) se comparte y poda todo nodo con
+# f >= incumbent. Se termina cuando todos los procesos están ociosos (sin
+# nodos con f < incumbent) y no hay lotes en tránsito (enviados == recibidos
+# en dos lecturas iguales seguidas): ahí ningún nodo puede mejorar la
+# solución, así que es óptima con una heurística admisible.
+BATCH = 64          # nodos por lote antes de enviarlo
+POLL_EVERY = 64     # expansiones entre lecturas del buzón
+IDLE_WAIT = 0.005   # espera de un proceso ocioso por un lote (s)
+CHECK_EVERY = 0.002 # pausa del coordinador entre comprobaciones (s)
+NO_SOLUTION = (1 << 62)
+
+# Contadores compartidos por proceso (cada uno solo escribe los suyos)
+SENT, RECEIVED, EXPANDED, GENERATED = range(4)
+
+# Función para elegir el proceso dueño de un estado empaquetado: hash
+# multiplicativo, porque los bits bajos (la ficha de la casilla 0) se
+# repartirían muy mal
+def owner(state, workers):
+    return ((state * 0x9E3779B97F4A7C15) >> 40) % workers
+
+def _hda_worker(me, workers, start, goal, heuristic, size, inboxes, replies, incumbent, lock,
+                counters, idle, stop):
+    h_full, h_update = packed_heuristic(heuristic, size)
+    # Al cortar por presupuesto pueden quedar lotes sin leer; no esperar a
+    # que se vacíen las colas al salir
+    for channel in inboxes + [replies]:
+        channel.cancel_join_thread()
+    inbox = inboxes[me]
+    base = 4 * me
+    open_list = []
+    g = {}
+    came_from = {}
+    outbox = [[] for _ in range(workers)]
+    sent = received = expanded = generated = 0
+
+    # Recibe un nodo del que este proceso es dueño
+    def accept(state, cost, h, direction):
+        if cost >= g.get(state, cost + 1):
+            return
+        g[state] = cost
+        came_from[state] = direction
+        if state == goal:
+            with lock:
+                if cost < incumbent.value:
+                    incumbent.value = cost
+        elif cost + h < incumbent.value:
+            heapq.heappush(open_list, (cost + h, -cost, state, h))
+
+    def flush(dest):
+        nonlocal sent
+        batch = outbox[dest]
+        outbox[dest] = []
+        sent += len(batch)
+        counters[base + SENT] = sent
+        inboxes[dest].put(batch)
+
+    # Atiende un mensaje del buzón: un lote de nodos, una consulta de
+    # came_from del coordinador o None para terminar. Devuelve False al
+    # recibir None.
+    def handle(message):
+        nonlocal received
+        if message is None:
+            return False
+        if isinstance(message, tuple):
+            replies.put(came_from[message[1]])
+            return True
+        idle[me] = 0
+        received += len(message)
+        counters[base + RECEIVED] = received
+        if not stop.value:
+            for node in message:
+                accept(*node)
+        return True
+
+    if owner(start, workers) == me:
+        accept(start, 0, h_full(start), None)
+
+    while True:
+        best = incumbent.value
+        while open_list and (open_list[0][0] >= best or -open_list[0][1] != g[open_list[0][2]]):
+            heapq.heappop(open_list)
+
+        if not open_list or stop.value:
+            # Ocioso: enviar lo pendiente, avisar y esperar un lote
+            for dest in range(workers):
+                if outbox[dest]:
+                    flush(dest)
+            counters[base + EXPANDED], counters[base + GENERATED] = expanded, generated
+            idle[me] = 1
+            try:
+                message = inbox.get(timeout=IDLE_WAIT)
+            except queue.Empty:
+                continue
+            if not handle(message):
+                return
+            continue
+
+        f, neg_cost, state, h = heapq.heappop(open_list)
+        new_cost = 1 - neg_cost
+        back = None if came_from[state] is None else came_from[state] ^ 1
+        children = expand_packed(state, size)
+        generated += len(children)
+        for direction, tile, blank, child in children:
+            if direction == back:
+                continue
+            h_child = h_update(h, tile, blank, direction) if h_update else h_full(child)
+            if new_cost + h_child >= best:
+                continue
+            dest = owner(child, workers)
+            if dest == me:
+                accept(child, new_cost, h_child, direction)
+            else:
+                outbox[dest].append((child, new_cost, h_child, direction))
+                if len(outbox[dest]) >= BATCH:
+                    flush(dest)
+
+        expanded += 1
+        if expanded % POLL_EVERY == 0:
+            counters[base + EXPANDED], counters[base + GENERATED] = expanded, generated
+            for dest in range(workers):
+                if outbox[dest]:
+                    flush(dest)
+            while True:
+                try:
+                    message = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if not handle(message):
+                    return
+
+# Algoritmo HDA* sobre estados empaquetados con `workers` procesos (por
+# defecto uno por CPU). Devuelve el camino óptimo de estados empaquetados o
+# None. Con un Budget, el coordinador vigila tiempo, cancelación y nodos
+# expandidos (sumando los de todos los procesos) y al agotarlo lanza
+# BudgetExceeded con el costo de la mejor solución encontrada, si la hay.
+def hda_star_packed(start, goal, heuristic, size=3, workers=None, stats=None, budget=None):
+    workers = workers or os.cpu_count() or 1
+    budget = make_budget(budget)
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    replies = context.Queue()
+    lock = context.Lock()
+    incumbent = context.Value('q', NO_SOLUTION, lock=False)
+    counters = context.Array('q', 4 * workers, lock=False)
+    idle = context.Array('b', workers, lock=False)
+    stop = context.Value('b', 0, lock=False)
+    processes = [context.Process(target=_hda_worker, daemon=True,
+                                 args=(me, workers, start, goal, heuristic, size, inboxes, replies,
+                                       incumbent, lock, counters, idle, stop))
+                 for me in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        # Detección de terminación: todos ociosos, tantos nodos recibidos
+        # como enviados y los mismos contadores en dos lecturas seguidas
+        previous = None
+        while True:
+            time.sleep(CHECK_EVERY)
+            snapshot = tuple(counters[:])
+            if budget is not None:
+                budget.expanded = sum(snapshot[EXPANDED::4])
+                if budget.max_expanded is not None and budget.expanded > budget.max_expanded:
+                    budget.reason = 'nodes'
+                if budget.reason is not None or budget.check():
+                    stop.value = 1
+                    cost = incumbent.value
+                    raise budget.exceeded(upper_bound=None if cost == NO_SOLUTION else cost)
+            if all(idle[:]) and sum(snapshot[SENT::4]) == sum(snapshot[RECEIVED::4]):
+                if snapshot == previous and all(idle[:]):
+                    break
+                previous = snapshot
+            else:
+                previous = None
+            if not any(process.is_alive() for process in processes):
+                raise RuntimeError("Los procesos de HDA* terminaron antes de tiempo.")
+
+        if stats is not None:
+            stats.nodes_expanded = sum(snapshot[EXPANDED::4])
+            stats.nodes_generated = sum(snapshot[GENERATED::4])
+        cost = incumbent.value
+        if cost == NO_SOLUTION:
+            if stats is not None:
+                stats.finish()
+            return None
+
+        # Reconstruir el camino preguntando a cada dueño por qué movimiento
+        # llegó a su estado
+        codes = []
+        current = goal
+        while current != start:
+            inboxes[owner(current, workers)].put(('came_from', current))
+            direction = replies.get()
+            codes.append(direction)
+            current = apply_move(current, direction ^ 1, size)
+        path = [start]
+        for direction in reversed(codes):
+            path.append(apply_move(path[-1], direction, size))
+        if stats is not None:
+            stats.finish(len(path) - 1)
+        return path
+    finally:
+        stop.value = 1
+        for inbox in inboxes:
+            inbox.put(None)
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,301 @@
+from collections import deque
+import numpy as np
+
+# Desplazamientos del espacio vacío: 0 arriba, 1 abajo, 2 izquierda, 3 derecha
+OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Función para construir la tabla de posiciones objetivo (ficha -> índice)
+def goal_positions(goal):
+    goal = [int(t) for t in np.asarray(goal).ravel()]
+    positions = [0] * len(goal)
+    for i, tile in enumerate(goal):
+        positions[tile] = i
+    return positions
+
+# Todas las heurísticas comparten la misma interfaz:
+#   evaluate(tiles)  -> h de una tupla plana de fichas (Python puro)
+#   batch(boards)    -> h de una matriz (k, celdas) en una sola expresión NumPy
+#   __call__(state, goal) para usarlas como las heurísticas sobre ndarrays
+# y, si la h se puede actualizar en O(1), update(h, ficha, vacío, dirección).
+class Heuristic:
+    name = None
+
+    def __init__(self, goal):
+        self.goal = tuple(int(t) for t in np.asarray(goal).ravel())
+        self.cells = len(self.goal)
+        self.size = int(round(self.cells ** 0.5))
+
+    def batch(self, boards):
+        return np.array([self.evaluate(tuple(board)) for board in np.asarray(boards).tolist()])
+
+    def __call__(self, state, goal=None):
+        return int(self.batch(np.asarray(state).reshape((1, -1)))[0])
+
+# Número de fichas fuera de su lugar (sin contar el espacio vacío)
+class Hamming(Heuristic):
+    name = 'hamming'
+
+    def __init__(self, goal):
+        super().__init__(goal)
+        self.goal_array = np.array(self.goal)
+
+    def evaluate(self, tiles):
+        goal = self.goal
+        return sum(1 for pos, tile in enumerate(tiles) if tile != 0 and tile != goal[pos])
+
+    def update(self, h, tile, blank, direction):
+        dx, dy = OFFSETS[direction]
+        source = blank + dx * self.size + dy
+        return h + (tile == self.goal[source]) - (tile == self.goal[blank])
+
+    def batch(self, boards):
+        boards = np.asarray(boards)
+        return ((boards != self.goal_array) & (boards != 0)).sum(axis=1)
+
+# Distancia Manhattan con tablas precalculadas. evaluate() calcula h desde
+# cero; update() obtiene la h del hijo en O(1) a partir de la h del padre, la
+# ficha movida, la posición del vacío en el padre y la dirección del vacío.
+class Manhattan(Heuristic):
+    name = 'manhattan'
+
+    def __init__(self, goal):
+        super().__init__(goal)
+        cells, size = self.cells, self.size
+        positions = goal_positions(self.goal)
+
+        # dist[ficha][posición]: distancia de la ficha a su casilla objetivo
+        self.dist = [[0] * cells for _ in range(cells)]
+        for tile in range(1, cells):
+            gx, gy = divmod(positions[tile], size)
+            for pos in range(cells):
+                x, y = divmod(pos, size)
+                self.dist[tile][pos] = abs(x - gx) + abs(y - gy)
+        self.dist_array = np.array(self.dist)
+
+        # delta[ficha][vacío * 4 + dirección]: cambio de h al mover la ficha
+        # desde la casilla vecina del vacío hasta la casilla del vacío
+        self.delta = [[0] * (cells * 4) for _ in range(cells)]
+        for blank in range(cells):
+            x, y = divmod(blank, size)
+            for direction, (dx, dy) in enumerate(OFFSETS):
+                new_x, new_y = x + dx, y + dy
+                if 0 <= new_x < size and 0 <= new_y < size:
+                    source = new_x * size + new_y
+                    for tile in range(1, cells):
+                        self.delta[tile][blank * 4 + direction] = self.dist[tile][blank] - self.dist[tile][source]
+
+    def evaluate(self, tiles):
+        dist = self.dist
+        return sum(dist[tile][pos] for pos, tile in enumerate(tiles))
+
+    def update(self, h, tile, blank, direction):
+        return h + self.delta[tile][blank * 4 + direction]
+
+    def batch(self, boards):
+        boards = np.asarray(boards)
+        return self.dist_array[boards, np.arange(self.cells)].sum(axis=1)
+
+# Función para calcular la penalización de conflicto lineal de una línea:
+# 2 por cada ficha que hay que sacar de la línea para que las restantes
+# queden en orden (longitud menos la subsecuencia creciente más larga).
+def line_conflict(targets):
+    if len(targets) < 2:
+        return 0
+    longest = [1] * len(targets)
+    for i in range(len(targets)):
+        for j in range(i):
+            if targets[j] < targets[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return 2 * (len(targets) - max(longest))
+
+# Manhattan más conflicto lineal: dos fichas en su fila (o columna) objetivo
+# pero en orden invertido obligan a que una salga y vuelva a entrar.
+class LinearConflict(Manhattan):
+    name = 'linear_conflict'
+    # El conflicto no se puede actualizar en O(1): sin update, los motores
+    # evalúan cada hijo completo en vez de heredar el update de Manhattan
+    update = None
+
+    def __init__(self, goal):
+        super().__init__(goal)
+        cells, size = self.cells, self.size
+        positions = goal_positions(self.goal)
+        # lines: índices de las casillas de cada fila y cada columna
+        self.lines = [[r * size + c for c in range(size)] for r in range(size)]
+        self.lines += [[r * size + c for r in range(size)] for c in range(size)]
+        # targets[línea][ficha]: columna (o fila) objetivo de la ficha si su
+        # meta está en esa línea, -1 si no
+        self.targets = []
+        for number in range(2 * size):
+            is_row, index = number < size, number % size
+            target = [-1] * cells
+            for tile in range(1, cells):
+                gx, gy = divmod(positions[tile], size)
+                if (gx if is_row else gy) == index:
+                    target[tile] = gy if is_row else gx
+            self.targets.append(target)
+        self.target_arrays = np.array(self.targets)
+        # Conflicto por secuencia de metas: se guarda por las metas de las
+        # fichas que están en su línea, no por el contenido de la línea, así
+        # que hay a lo sumo unas e * size! claves (326 en 5x5) para todas las
+        # líneas y el memo no crece con los tableros que se evalúan
+        self.memo = {}
+
+    def penalty(self, number, contents):
+        target = self.targets[number]
+        key = tuple(target[t] for t in contents if target[t] >= 0)
+        penalty = self.memo.get(key)
+        if penalty is None:
+            penalty = self.memo[key] = line_conflict(key)
+        return penalty
+
+    def evaluate(self, tiles):
+        h = Manhattan.evaluate(self, tiles)
+        for number, line in enumerate(self.lines):
+            h += self.penalty(number, tuple(tiles[pos] for pos in line))
+        return h
+
+    def batch(self, boards):
+        boards = np.asarray(boards)
+        h = Manhattan.batch(self, boards)
+        for number, line in enumerate(self.lines):
+            targets = self.target_arrays[number][boards[:, line]]
+            valid = targets >= 0
+            # Subsecuencia creciente más larga, columna por columna
+            longest = valid.astype(np.int64)
+            for i in range(self.size):
+                for j in range(i):
+                    chain = valid[:, i] & valid[:, j] & (targets[:, j] < targets[:, i])
+                    longest[:, i] = np.maximum(longest[:, i], np.where(chain, longest[:, j] + 1, 0))
+            h = h + 2 * (valid.sum(axis=1) - longest.max(axis=1))
+        return h
+
+# Función para construir la tabla de distancia de caminata (walking distance)
+# de un tablero size x size. Un estado cuenta, para cada fila, cuántas fichas
+# tiene de cada fila objetivo, más la fila del vacío; un movimiento vertical
+# lleva una ficha de una fila vecina a la fila del vacío.
+def build_walking_table(size, goal_blank_row):
+    goal_counts = [[size if r == g else 0 for g in range(size)] for r in range(size)]
+    goal_counts[goal_blank_row][goal_blank_row] -= 1
+    start = (tuple(tuple(row) for row in goal_counts), goal_blank_row)
+    table = {start: 0}
+    queue = deque([start])
+
+    while queue:
+        state = queue.popleft()
+        counts, blank = state
+        dist = table[state] + 1
+        for row in (blank - 1, blank + 1):
+            if 0 <= row < size:
+                for g in range(size):
+                    if counts[row][g]:
+                        new_counts = [list(r) for r in counts]
+                        new_counts[row][g] -= 1
+                        new_counts[blank][g] += 1
+                        new_state = (tuple(tuple(r) for r in new_counts), row)
+                        if new_state not in table:
+                            table[new_state] = dist
+                            queue.append(new_state)
+    return table
+
+# Distancia de caminata: suma de la parte vertical (filas) y horizontal
+# (columnas), cada una leída de una tabla precalculada. Domina a Manhattan y
+# es admisible porque cada movimiento solo cambia una de las dos partes.
+class WalkingDistance(Heuristic):
+    name = 'walking_distance'
+    _tables = {}
+
+    def __init__(self, goal):
+        super().__init__(goal)
+        size = self.size
+        if size > 4:
+            raise ValueError("La distancia de caminata solo está disponible hasta 4x4.")
+        positions = goal_positions(self.goal)
+        self.goal_row = [positions[tile] // size for tile in range(self.cells)]
+        self.goal_col = [positions[tile] % size for tile in range(self.cells)]
+        blank_row, blank_col = divmod(positions[0], size)
+        self.row_table = self.encoded_table(size, blank_row)
+        self.col_table = self.encoded_table(size, blank_col)
+
+    # Tabla compartida por tamaño y fila del vacío, con los estados
+    # codificados como enteros (conteos en base size + 1) para NumPy
+    @classmethod
+    def encoded_table(cls, size, blank_row):
+        key = (size, blank_row)
+        if key not in cls._tables:
+            codes, values = [], []
+            for (counts, blank), dist in build_walking_table(size, blank_row).items():
+                codes.append(cls.encode(size, [c for row in counts for c in row], blank))
+                values.append(dist)
+            order = np.argsort(codes)
+            cls._tables[key] = (np.array(codes)[order], np.array(values, dtype=np.uint8)[order],
+                                dict(zip(codes, values)))
+        return cls._tables[key]
+
+    @staticmethod
+    def encode(size, counts, blank):
+        code = blank
+        for c in counts:
+            code = code * (size + 1) + c
+        return code
+
+    def part(self, tiles, goal_line, by_rows, table):
+        size = self.size
+        counts = [0] * (size * size)
+        blank = 0
+        for pos, tile in enumerate(tiles):
+            line = pos // size if by_rows else pos % size
+            if tile == 0:
+                blank = line
+            else:
+                counts[line * size + goal_line[tile]] += 1
+        return table[2][self.encode(size, counts, blank)]
+
+    def evaluate(self, tiles):
+        return (self.part(tiles, self.goal_row, True, self.row_table)
+                + self.part(tiles, self.goal_col, False, self.col_table))
+
+    def batch_part(self, boards, goal_line, lines, table):
+        size = self.size
+        k = boards.shape[0]
+        blank_line = lines[np.argmax(boards == 0, axis=1)]
+        targets = np.asarray(goal_line)[boards]
+        # counts[b, fila, fila objetivo], sin contar el vacío
+        counts = np.zeros((k, size * size), dtype=np.int64)
+        np.add.at(counts, (np.repeat(np.arange(k), self.cells), (lines * size + targets).ravel()),
+                  (boards != 0).ravel().astype(np.int64))
+        codes = blank_line.astype(np.int64)
+        for i in range(size * size):
+            codes = codes * (size + 1) + counts[:, i]
+        return table[1][np.searchsorted(table[0], codes)].astype(np.int64)
+
+    def batch(self, boards):
+        boards = np.asarray(boards)
+        rows = np.arange(self.cells) // self.size
+        cols = np.arange(self.cells) % self.size
+        return (self.batch_part(boards, self.goal_row, rows, self.row_table)
+                + self.batch_part(boards, self.goal_col, cols, self.col_table))
+
+# Función para cargar la base de patrones sin importar PuzzletPDB al inicio
+def pattern_database(goal):
+    from PuzzletPDB import get_pattern_database
+    return get_pattern_database(goal)
+
+# Registro de heurísticas: nombre -> constructor que recibe el objetivo
+HEURISTICS = {
+    'hamming': Hamming,
+    'manhattan': Manhattan,
+    'linear_conflict': LinearConflict,
+    'walking_distance': WalkingDistance,
+    'pdb': pattern_database,
+}
+
+# Función para registrar una heurística nueva con un nombre
+def register_heuristic(name, factory):
+    HEURISTICS[name] = factory
+
+# Función para obtener una heurística por nombre para un objetivo dado
+def get_heuristic(name, goal):
+    if name not in HEURISTICS:
+        raise ValueError(f"Heurística desconocida: {name}. Opciones: {', '.join(HEURISTICS)}")
+    return HEURISTICS[name](goal)
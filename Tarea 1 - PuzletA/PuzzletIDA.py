@@ -0,0 +1,101 @@
+import numpy as np
+from PuzzletBits import (pack, unpack, unpack_tiles, expand_packed, packed_heuristic, board_size,
+                         path_to_came_from, path_to_moves)
+from PuzzletHeuristics import Manhattan
+from PuzzletSolvable import is_solvable
+from PuzzletStats import timed
+
+# Función para adaptar una heurística sobre ndarrays, heuristic(state, goal),
+# a una que recibe el estado empaquetado
+def wrap_array_heuristic(heuristic, goal_state, size):
+    def h_packed(packed):
+        return heuristic(unpack(packed, size), goal_state)
+    return h_packed
+
+# Algoritmo IDA* sobre estados empaquetados. Búsqueda en profundidad con
+# cota f creciente: la memoria es lineal en la profundidad de la solución.
+# Devuelve la lista de estados empaquetados desde start hasta goal. En stats,
+# max_frontier es la profundidad máxima de la pila y duplicates_pruned cuenta
+# los movimientos que deshacían el anterior. Con un Budget, al agotarlo lanza
+# BudgetExceeded; la cota de la iteración en curso es una cota inferior.
+# Un tablero sin solución devuelve None sin buscar: como solo se evita
+# deshacer el último movimiento, las iteraciones no terminarían nunca.
+def ida_star_packed(start, goal, heuristic, size=3, stats=None, budget=None):
+    if not is_solvable(unpack_tiles(start, size), unpack_tiles(goal, size)):
+        return None
+    h_full, h_update = packed_heuristic(heuristic, size)
+    h_full = timed(h_full, stats, 'heuristic_time')
+    h_update = timed(h_update, stats, 'heuristic_time')
+    path = [start]
+    found = []
+    # Mejor estado alcanzado hasta ahora: (h, camino hasta él)
+    best = [h_full(start), [start]]
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+
+    # Devuelve la menor f que superó la cota (o -1 si encontró la meta)
+    def search(state, g, h, bound, last_direction):
+        f = g + h
+        if f > bound:
+            return f
+        if state == goal:
+            found.append(list(path))
+            return -1
+        minimum = float('inf')
+        children = expand_packed(state, size)
+        if stats is not None:
+            stats.nodes_generated += len(children)
+            stats.expanded(len(path))
+        if budget is not None:
+            if h < best[0]:
+                best[:] = [h, list(path)]
+            if budget.charge(len(path)):
+                if stats is not None:
+                    stats.finish()
+                raise budget.exceeded(lower_bound=bound, best_state=unpack_tiles(best[1][-1], size),
+                                      best_h=best[0], moves=path_to_moves(best[1], size))
+        for direction, tile, blank, child in children:
+            # No deshacer el movimiento anterior (0<->1 y 2<->3)
+            if direction ^ 1 == last_direction:
+                if stats is not None:
+                    stats.duplicates_pruned += 1
+                continue
+            h_child = h_update(h, tile, blank, direction) if h_update else h_full(child)
+            path.append(child)
+            t = search(child, g + 1, h_child, bound, direction)
+            path.pop()
+            if t == -1:
+                return -1
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    h_start = h_full(start)
+    bound = h_start
+    while True:
+        t = search(start, 0, h_start, bound, -1)
+        if t == -1:
+            if stats is not None:
+                stats.finish(len(found[0]) - 1)
+            return found[0]
+        if t == float('inf'):
+            if stats is not None:
+                stats.finish()
+            return None
+        bound = t
+
+# Algoritmo IDA* con la misma forma de llamada que a_star: acepta cualquier
+# tamaño de tablero y devuelve (came_from, cost_so_far) solo con los estados
+# del camino, compatible con reconstruct_path; (None, None) sin solución.
+def ida_star(initial_state, goal_state, heuristic=None, stats=None, budget=None):
+    initial_state = np.asarray(initial_state)
+    size = board_size(initial_state.size)
+    if heuristic is None:
+        heuristic = Manhattan(goal_state)
+    elif not hasattr(heuristic, 'evaluate'):
+        heuristic = wrap_array_heuristic(heuristic, goal_state, size)
+
+    path = ida_star_packed(pack(initial_state), pack(goal_state), heuristic, size, stats, budget)
+    return path_to_came_from(path, size, initial_state.dtype)
@@ -1,5 +1,6 @@
 import heapq
 import numpy as np
+from PuzzletSolvable import is_solvable
 
 # Heurísticas: Hamming y Manhattan
 def hamming(state, goal):
@@ -110,6 +111,10 @@ goal_state = np.array([[1, 2, 3],
                        [4, 5, 6], 
                        [7, 8, 0]])
 
+# Descartar tableros sin solución antes de buscar
+if not is_solvable(initial_state, goal_state):
+    raise SystemExit("El puzzle no tiene solución (la paridad de inversiones no coincide con el objetivo).")
+
 # Selección de la heurística
 heuristic_choice = input("Elige la heurística: 1 para Hamming, 2 para Manhattan: ")
 if heuristic_choice == '1':
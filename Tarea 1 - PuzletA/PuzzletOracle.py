@@ -0,0 +1,121 @@
+import os
+from collections import deque
+import numpy as np
+from PuzzletBits import pack, unpack, neighbors_packed
+from PuzzletRank import rank_packed, state_space_size
+from PuzzletSolvable import is_solvable
+
+# Tabla de distancias exactas del 8-puzzle: un byte por estado alcanzable,
+# indexado por rank_state. Cabecera: firma + fichas del objetivo. No usa las
+# simetrías del objetivo: guardar solo los canónicos necesitaría otro
+# ranking y la tabla ocupa lo mismo a propósito.
+MAGIC = b'PZOR'
+UNREACHED = 255
+DEFAULT_GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Función para obtener la ruta de la tabla de un objetivo; la del objetivo
+# estándar conserva el nombre oracle_3x3.bin
+def oracle_path(goal=DEFAULT_GOAL):
+    goal = tuple(goal)
+    if goal == DEFAULT_GOAL:
+        return os.path.join(DIRECTORY, 'oracle_3x3.bin')
+    return os.path.join(DIRECTORY, f"oracle_3x3_{''.join(str(t) for t in goal)}.bin")
+
+DEFAULT_PATH = oracle_path()
+
+# Función para construir la tabla con un BFS retrógrado desde el objetivo
+def build_oracle(goal=DEFAULT_GOAL):
+    goal = pack(goal)
+    table = bytearray([UNREACHED]) * state_space_size(9)
+    table[rank_packed(goal)] = 0
+    queue = deque([goal])
+
+    while queue:
+        current = queue.popleft()
+        dist = table[rank_packed(current)] + 1
+        for neighbor in neighbors_packed(current):
+            index = rank_packed(neighbor)
+            if table[index] == UNREACHED:
+                table[index] = dist
+                queue.append(neighbor)
+
+    return table
+
+# Función para guardar la tabla en disco. Se escribe en un archivo temporal
+# de este proceso y luego se reemplaza, así los procesos que la construyen a
+# la vez nunca leen un archivo a medias.
+def save_oracle(table, goal=DEFAULT_GOAL, path=DEFAULT_PATH):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(MAGIC + bytes(goal))
+        f.write(table)
+    os.replace(temporary, path)
+
+# Función para cargar la tabla con memoria mapeada; devuelve (goal, tabla)
+def load_oracle(path=DEFAULT_PATH):
+    with open(path, 'rb') as f:
+        header = f.read(len(MAGIC) + 9)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} no es una tabla de distancias válida.")
+    goal = tuple(header[len(MAGIC):])
+    table = np.memmap(path, dtype=np.uint8, mode='r', offset=len(header))
+    if len(table) != state_space_size(9):
+        raise ValueError(f"{path} está incompleta: tiene {len(table)} entradas.")
+    return goal, table
+
+# Tablas ya abiertas en este proceso, por (objetivo, ruta)
+_oracles = {}
+
+# Función para obtener la tabla de un objetivo: se construye la primera vez
+# que falta el archivo y se mapea una sola vez por proceso. Sin path se usa
+# la tabla propia del objetivo (oracle_path).
+def get_oracle(goal=DEFAULT_GOAL, path=None):
+    goal = tuple(int(t) for t in goal)
+    if len(goal) != 9:
+        raise ValueError("La tabla de distancias solo existe para el 8-puzzle (3x3).")
+    path = path or oracle_path(goal)
+    key = (goal, path)
+    if key not in _oracles:
+        if not os.path.exists(path):
+            save_oracle(build_oracle(goal), goal, path)
+        oracle_goal, table = load_oracle(path)
+        if oracle_goal != goal:
+            raise ValueError("La tabla de distancias se construyó para otro objetivo.")
+        _oracles[key] = table
+    return _oracles[key]
+
+# Función para leer la distancia óptima de un estado en O(1)
+def oracle_distance(table, state):
+    return int(table[rank_packed(state)])
+
+# Función para recorrer la tabla: en cada paso se elige un vecino con
+# distancia una unidad menor, lo que da un camino óptimo sin cola ni came_from
+def solve_oracle(table, start):
+    dist = oracle_distance(table, start)
+    if dist == UNREACHED:
+        return []
+
+    path = [start]
+    current = start
+    while dist > 0:
+        for neighbor in neighbors_packed(current):
+            if oracle_distance(table, neighbor) == dist - 1:
+                current = neighbor
+                break
+        path.append(current)
+        dist -= 1
+    return path
+
+# Función para resolver a partir de ndarrays usando la tabla precalculada
+def solve_with_oracle(initial_state, goal_state, path=None):
+    goal = tuple(int(t) for t in np.asarray(goal_state).ravel())
+    if not is_solvable(initial_state, goal_state):
+        return []
+    table = get_oracle(goal, path)
+    return [unpack(state) for state in solve_oracle(table, pack(initial_state))]
+
+# Construir la tabla una sola vez desde la línea de comandos
+if __name__ == "__main__":
+    save_oracle(build_oracle())
+    print(f"Tabla de distancias guardada en {DEFAULT_PATH}")
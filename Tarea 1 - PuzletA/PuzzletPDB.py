@@ -0,0 +1,202 @@
+import os
+import sys
+import numpy as np
+from PuzzletBits import board_size
+from PuzzletHeuristics import OFFSETS
+from PuzzletRank import table_size, rank_positions, unrank_positions
+from PuzzletSymmetry import get_symmetry
+
+# Bases de datos de patrones aditivas y disjuntas. Cada patrón es un grupo de
+# fichas; su tabla guarda, para cada colocación de esas fichas, el mínimo de
+# movimientos de fichas del patrón para llevarlas al objetivo (las demás
+# fichas se tratan como huecos). Como cada movimiento solo se cuenta en un
+# patrón, la suma de las tablas de una partición sigue siendo admisible.
+MAGIC = b'PZPDB'
+VERSION = 1
+UNREACHED = 255
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb')
+
+# Particiones por defecto (objetivo estándar con el vacío al final)
+DEFAULT_PARTITIONS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 5, 6, 9, 13), (3, 4, 7, 8, 11, 12), (10, 14, 15)],
+    5: [(1, 2, 6, 7, 11, 12), (3, 4, 5, 8, 9, 10), (13, 14, 18, 19, 23, 24), (15, 16, 17, 20, 21, 22)],
+}
+
+# Función para construir la tabla de un patrón con un BFS por capas
+# vectorizado con NumPy, desde la colocación objetivo de las fichas.
+def build_pattern(goal, pattern):
+    goal = [int(t) for t in np.asarray(goal).ravel()]
+    cells = len(goal)
+    size = board_size(cells)
+    k = len(pattern)
+    table = np.full(table_size(cells, k), UNREACHED, dtype=np.uint8)
+    start = rank_positions([goal.index(tile) for tile in pattern], cells)
+    table[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    depth = 0
+
+    while frontier.size:
+        positions = unrank_positions(frontier, cells, k)
+        occupied = np.zeros((frontier.size, cells), dtype=bool)
+        occupied[np.arange(frontier.size)[:, None], positions] = True
+        rows, cols = np.divmod(positions, size)
+        found = []
+        for i in range(k):
+            for dx, dy in OFFSETS:
+                new_rows, new_cols = rows[:, i] + dx, cols[:, i] + dy
+                valid = (new_rows >= 0) & (new_rows < size) & (new_cols >= 0) & (new_cols < size)
+                new_pos = np.where(valid, new_rows * size + new_cols, 0)
+                valid &= ~occupied[np.arange(frontier.size), new_pos]
+                moved = positions[valid].copy()
+                moved[:, i] = new_pos[valid]
+                found.append(rank_positions(moved, cells))
+        depth += 1
+        candidates = np.unique(np.concatenate(found))
+        frontier = candidates[table[candidates] == UNREACHED]
+        table[frontier] = depth
+
+    return table
+
+# Función para obtener la ruta del archivo de un patrón
+def pattern_path(size, pattern, directory=DEFAULT_DIR):
+    return os.path.join(directory, f"pdb_{size}x{size}_{'-'.join(str(t) for t in pattern)}.bin")
+
+# Formato (versión 1): firma, versión, tamaño, número de fichas, fichas del
+# patrón, fichas del objetivo y luego un byte por colocación. Se escribe en
+# un archivo temporal de este proceso y luego se reemplaza, así otro proceso
+# que construya la misma tabla a la vez nunca lee un archivo a medias.
+def save_pattern(table, goal, pattern, path):
+    goal = [int(t) for t in np.asarray(goal).ravel()]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(MAGIC + bytes([VERSION, board_size(len(goal)), len(pattern)]))
+        f.write(bytes(pattern) + bytes(goal))
+        f.write(np.asarray(table, dtype=np.uint8).tobytes())
+    os.replace(temporary, path)
+
+# Función para cargar un patrón con memoria mapeada; devuelve
+# (objetivo, patrón, tabla)
+def load_pattern(path):
+    with open(path, 'rb') as f:
+        header = f.read(len(MAGIC) + 3)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} no es una base de patrones válida.")
+        version, size, k = header[len(MAGIC):]
+        if version != VERSION:
+            raise ValueError(f"{path} tiene la versión {version}; se esperaba la {VERSION}.")
+        pattern = tuple(f.read(k))
+        goal = tuple(f.read(size * size))
+    offset = len(header) + k + size * size
+    table = np.memmap(path, dtype=np.uint8, mode='r', offset=offset)
+    if len(table) != table_size(size * size, k):
+        raise ValueError(f"{path} está incompleto: tiene {len(table)} entradas y se esperaban "
+                         f"{table_size(size * size, k)}.")
+    return goal, pattern, table
+
+# Función para construir y guardar todas las tablas de una partición; el
+# progreso se escribe en stderr para no mezclarse con la salida del programa
+def build_partition(goal, partition=None, directory=DEFAULT_DIR, verbose=False):
+    goal = [int(t) for t in np.asarray(goal).ravel()]
+    size = board_size(len(goal))
+    for pattern in partition or DEFAULT_PARTITIONS[size]:
+        if verbose:
+            print(f"Construyendo patrón {pattern}...", file=sys.stderr)
+        path = pattern_path(size, pattern, directory)
+        save_pattern(build_pattern(goal, pattern), goal, pattern, path)
+
+# Heurística aditiva: suma de las tablas de una partición disjunta. No tiene
+# update(), así que los motores la evalúan completa en cada nodo; batch()
+# calcula h para una matriz de tableros en el motor vectorizado.
+# Con symmetric=True también se consultan las tablas con las imágenes
+# simétricas del tablero (que tienen el mismo costo óptimo) y se toma el
+# máximo. Esto solo mejora h: las tablas siguen guardando todas las
+# posiciones del patrón, no solo las canónicas, así que no ahorran memoria.
+class PatternDatabase:
+    def __init__(self, goal, partition=None, directory=DEFAULT_DIR, symmetric=True):
+        self.goal = tuple(int(t) for t in np.asarray(goal).ravel())
+        self.cells = len(self.goal)
+        self.size = board_size(self.cells)
+        self.symmetry = get_symmetry(self.goal) if symmetric else None
+        self.patterns = []
+        for pattern in partition or DEFAULT_PARTITIONS[self.size]:
+            path = pattern_path(self.size, pattern, directory)
+            goal_in_file, pattern, table = load_pattern(path)
+            if goal_in_file != self.goal:
+                raise ValueError(f"{path} se construyó para otro objetivo.")
+            # Pesos de cada dígito del índice (base mixta cells, cells-1, ...)
+            weights = [table_size(self.cells - i - 1, len(pattern) - i - 1) for i in range(len(pattern))]
+            self.patterns.append((pattern, weights, table))
+
+    def evaluate(self, tiles):
+        h = self.lookup(tiles)
+        if self.symmetry is not None:
+            for index in range(1, len(self.symmetry)):
+                h = max(h, self.lookup(self.symmetry.image(tiles, index)))
+        return h
+
+    # Suma de las tablas para una tupla de fichas
+    def lookup(self, tiles):
+        where = [0] * self.cells
+        for pos, tile in enumerate(tiles):
+            where[tile] = pos
+        total = 0
+        for pattern, weights, table in self.patterns:
+            index = 0
+            for i, tile in enumerate(pattern):
+                pos = where[tile]
+                digit = pos
+                for previous in pattern[:i]:
+                    if where[previous] < pos:
+                        digit -= 1
+                index += digit * weights[i]
+            total += table[index]
+        return int(total)
+
+    # h de una matriz (k, celdas): las posiciones de cada ficha salen de
+    # argsort y los índices se calculan con rank_positions en bloque
+    def batch(self, boards):
+        boards = np.asarray(boards)
+        h = self.batch_lookup(boards)
+        if self.symmetry is not None:
+            for source, relabel, _, _ in self.symmetry.maps[1:]:
+                h = np.maximum(h, self.batch_lookup(np.asarray(relabel)[boards[:, source]]))
+        return h
+
+    def batch_lookup(self, boards):
+        where = np.argsort(boards, axis=1)
+        total = np.zeros(where.shape[0], dtype=np.int64)
+        for pattern, weights, table in self.patterns:
+            total += table[rank_positions(where[:, list(pattern)], self.cells)]
+        return total
+
+    # Permite usarla como las heurísticas sobre ndarrays: heuristic(state, goal)
+    def __call__(self, state, goal=None):
+        return self.evaluate([int(t) for t in np.asarray(state).ravel()])
+
+# Tamaño máximo de una tabla que se construye al vuelo la primera vez; las
+# más grandes (p. ej. los patrones de 6 fichas del 5x5, de 127,5 millones de
+# entradas cada uno) se construyen offline con python PuzzletPDB.py 5
+MAX_ONLINE_ENTRIES = 10 ** 7
+
+# Función para cargar la partición, construyéndola si faltan archivos
+def get_pattern_database(goal, partition=None, directory=DEFAULT_DIR):
+    goal = [int(t) for t in np.asarray(goal).ravel()]
+    size = board_size(len(goal))
+    patterns = partition or DEFAULT_PARTITIONS[size]
+    missing = [p for p in patterns if not os.path.exists(pattern_path(size, p, directory))]
+    if any(table_size(size * size, len(p)) > MAX_ONLINE_ENTRIES for p in missing):
+        raise ValueError(f"Faltan bases de patrones demasiado grandes para construirlas ahora; "
+                         f"constrúyelas antes con: python PuzzletPDB.py {size}")
+    if missing:
+        print("Construyendo las bases de patrones (solo la primera vez)...", file=sys.stderr)
+        build_partition(goal, missing, directory, verbose=True)
+    return PatternDatabase(goal, patterns, directory)
+
+# Construcción offline: python PuzzletPDB.py [tamaño]
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    goal = list(range(1, size * size)) + [0]
+    build_partition(goal, directory=DEFAULT_DIR, verbose=True)
+    print(f"Bases de patrones guardadas en {DEFAULT_DIR}")
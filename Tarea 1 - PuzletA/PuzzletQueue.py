@@ -0,0 +1,157 @@
+import heapq
+from itertools import count
+
+# Reglas de desempate entre nodos con la misma f: devuelven la clave de
+# prioridad completa. Un contador final mantiene el orden de inserción y
+# evita comparar los estados entre sí.
+TIE_BREAKS = {
+    'high_g': lambda f, g, h: (f, -g),
+    'low_h': lambda f, g, h: (f, h),
+    'low_g': lambda f, g, h: (f, g),
+}
+
+# Cola de prioridad binaria indexada: cada elemento aparece una sola vez y
+# su prioridad se puede bajar (decrease-key) sin dejar entradas obsoletas.
+class IndexedHeap:
+    def __init__(self):
+        self.heap = []
+        self.position = {}
+        self.counter = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def __bool__(self):
+        return bool(self.heap)
+
+    # Inserta el elemento o, si ya está, baja su prioridad cuando la nueva es
+    # menor. Devuelve True si la cola cambió.
+    def push(self, item, priority):
+        if item in self.position:
+            index = self.position[item]
+            if priority >= self.heap[index][0]:
+                return False
+            self.heap[index][0] = priority
+            self._sift_up(index)
+            return True
+        self.heap.append([priority, next(self.counter), item])
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+        return True
+
+    decrease_key = push
+
+    # Saca el elemento de menor prioridad; devuelve (prioridad, elemento)
+    def pop(self):
+        last = self.heap.pop()
+        if not self.heap:
+            del self.position[last[2]]
+            return last[0], last[2]
+        top = self.heap[0]
+        self.heap[0] = last
+        self.position[last[2]] = 0
+        del self.position[top[2]]
+        self._sift_down(0)
+        return top[0], top[2]
+
+    def peek(self):
+        return self.heap[0][0], self.heap[0][2]
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i][2]] = i
+        self.position[heap[j][2]] = j
+
+    def _less(self, i, j):
+        return self.heap[i][:2] < self.heap[j][:2]
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._less(index, parent):
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index):
+        size = len(self.heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._less(child, smallest):
+                    smallest = child
+            if smallest == index:
+                return
+            self._swap(index, smallest)
+            index = smallest
+
+# Cola de cubetas indexada: agrupa los elementos por f y por la clave de
+# desempate. Insertar, bajar la prioridad y sacar son O(1) salvo buscar la
+# menor f, que se guarda en un montículo pequeño de valores distintos.
+class BucketQueue:
+    def __init__(self):
+        self.buckets = {}   # f -> {desempate -> [elementos]}
+        self.fronts = []    # montículo de valores de f (puede tener obsoletos)
+        self.where = {}     # elemento -> (f, desempate, índice en la lista)
+
+    def __len__(self):
+        return len(self.where)
+
+    def __contains__(self, item):
+        return item in self.where
+
+    def __bool__(self):
+        return bool(self.where)
+
+    def push(self, item, priority):
+        f, tie = priority
+        if item in self.where:
+            old_f, old_tie, _ = self.where[item]
+            if (f, tie) >= (old_f, old_tie):
+                return False
+            self._remove(item)
+        bucket = self.buckets.get(f)
+        if bucket is None:
+            bucket = self.buckets[f] = {}
+            heapq.heappush(self.fronts, f)
+        items = bucket.setdefault(tie, [])
+        self.where[item] = (f, tie, len(items))
+        items.append(item)
+        return True
+
+    decrease_key = push
+
+    def _remove(self, item):
+        f, tie, index = self.where.pop(item)
+        bucket = self.buckets[f]
+        items = bucket[tie]
+        last = items.pop()
+        if index < len(items):
+            items[index] = last
+            self.where[last] = (f, tie, index)
+        if not items:
+            del bucket[tie]
+            if not bucket:
+                del self.buckets[f]
+
+    def peek(self):
+        while self.fronts[0] not in self.buckets:
+            heapq.heappop(self.fronts)
+        f = self.fronts[0]
+        tie = min(self.buckets[f])
+        return (f, tie), self.buckets[f][tie][-1]
+
+    def pop(self):
+        priority, item = self.peek()
+        self._remove(item)
+        return priority, item
+
+# Colas disponibles para los motores A*
+QUEUES = {
+    'bucket': BucketQueue,
+    'heap': IndexedHeap,
+}
@@ -0,0 +1,110 @@
+from math import factorial
+import numpy as np
+from PuzzletBits import tile_bits
+
+# Índices perfectos (sin huecos ni colisiones) de permutaciones y estados del
+# puzzle. Sirven para guardar datos por estado en arreglos planos (bytearray
+# o ndarray) indexados por rango en vez de diccionarios o conjuntos: un byte
+# o un bit por estado en lugar de más de cien bytes por entrada.
+FACTORIALS = [factorial(i) for i in range(26)]
+
+# Función para calcular el rango lexicográfico (código de Lehmer) de una
+# permutación de 0..n-1. Cada dígito es el número de elementos menores que
+# quedan a la derecha, que se cuenta en O(1) con una máscara de los usados.
+def rank_permutation(perm):
+    n = len(perm)
+    rank = 0
+    used = 0
+    for i, item in enumerate(perm):
+        rank += (item - (used & ((1 << item) - 1)).bit_count()) * FACTORIALS[n - 1 - i]
+        used |= 1 << item
+    return rank
+
+# Función inversa: obtiene la permutación de 0..n-1 con el rango dado
+def unrank_permutation(rank, n):
+    items = list(range(n))
+    perm = []
+    for i in range(n - 1, -1, -1):
+        index, rank = divmod(rank, FACTORIALS[i])
+        perm.append(items.pop(index))
+    return perm
+
+# Índice denso de un estado del puzzle entre los n!/2 estados alcanzables:
+# posición del vacío y rango de las fichas sin el vacío. Con el vacío fijo,
+# todas las permutaciones alcanzables tienen la misma paridad; las
+# permutaciones 2k y 2k+1 difieren en intercambiar las dos últimas fichas,
+# así que solo una es alcanzable y basta con rango // 2.
+def rank_state(tiles):
+    blank = tiles.index(0)
+    rest = [t - 1 for t in tiles if t != 0]
+    return blank * (FACTORIALS[len(rest)] // 2) + rank_permutation(rest) // 2
+
+# Lo mismo que rank_state, leyendo las fichas directamente del int empaquetado
+def rank_packed(packed, size=3):
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    cells = size * size
+    n = cells - 1
+    rank = 0
+    used = 0
+    i = 0
+    for pos in range(cells):
+        tile = (packed >> (bits * pos)) & mask
+        if tile:
+            item = tile - 1
+            rank += (item - (used & ((1 << item) - 1)).bit_count()) * FACTORIALS[n - 1 - i]
+            used |= 1 << item
+            i += 1
+    return (packed >> (bits * cells)) * (FACTORIALS[n] // 2) + rank // 2
+
+# Índice del hijo a partir del del padre. Un movimiento horizontal del vacío
+# no cambia el orden de las fichas, solo la posición del vacío, así que el
+# índice se desplaza en (n-1)!/2 sin recorrer el tablero; uno vertical salta
+# size - 1 fichas y se recalcula con rank_packed.
+def rank_after_move(index, direction, child, size=3):
+    if direction == 2:
+        return index - FACTORIALS[size * size - 1] // 2
+    if direction == 3:
+        return index + FACTORIALS[size * size - 1] // 2
+    return rank_packed(child, size)
+
+# Tamaño del índice denso para un tablero de n celdas
+def state_space_size(cells):
+    return FACTORIALS[cells] // 2
+
+# Número de colocaciones de k fichas en cells casillas: cells! / (cells - k)!
+def table_size(cells, k):
+    total = 1
+    for i in range(k):
+        total *= cells - i
+    return total
+
+# Función para calcular el índice de una colocación (permutación parcial),
+# como usan las bases de patrones. positions es un ndarray (M, k) o una
+# secuencia de k posiciones.
+def rank_positions(positions, cells):
+    positions = np.asarray(positions, dtype=np.int64)
+    single = positions.ndim == 1
+    positions = positions.reshape((-1, positions.shape[-1]))
+    k = positions.shape[1]
+    index = np.zeros(positions.shape[0], dtype=np.int64)
+    for i in range(k):
+        digit = positions[:, i] - (positions[:, :i] < positions[:, i:i + 1]).sum(axis=1)
+        index = index * (cells - i) + digit
+    return int(index[0]) if single else index
+
+# Función inversa de rank_positions para un vector de índices
+def unrank_positions(index, cells, k):
+    index = np.asarray(index, dtype=np.int64)
+    digits = np.empty((index.shape[0], k), dtype=np.int64)
+    for i in range(k - 1, -1, -1):
+        index, digits[:, i] = np.divmod(index, cells - i)
+    positions = np.empty_like(digits)
+    free = np.ones((index.shape[0], cells), dtype=bool)
+    rows = np.arange(index.shape[0])
+    for i in range(k):
+        # La casilla libre número digits[:, i] (contando desde 0)
+        order = np.cumsum(free, axis=1)
+        positions[:, i] = np.argmax(order == digits[:, i:i + 1] + 1, axis=1)
+        free[rows, positions[:, i]] = False
+    return positions
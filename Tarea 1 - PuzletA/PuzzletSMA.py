@@ -0,0 +1,193 @@
+import heapq
+from itertools import count
+from PuzzletBits import expand_packed, packed_heuristic, unpack_tiles, path_to_moves
+from PuzzletStats import timed
+
+# SMA* (A* con memoria acotada) sobre estados empaquetados. Guarda el árbol
+# de búsqueda con a lo sumo max_nodes nodos; cuando se llena, borra la peor
+# hoja (mayor f y, a igual f, la menos profunda) y su padre recuerda en
+# forgotten la menor f de los hijos olvidados, así que la rama se puede
+# regenerar cuando vuelva a ser la mejor. Las f se propagan hacia arriba
+# (backed-up f = mínimo de los hijos y de los olvidados) y nunca bajan, así
+# que la búsqueda sigue siendo óptima mientras el camino óptimo quepa en
+# memoria (profundidad < max_nodes); si no cabe, devuelve None.
+DEFAULT_MAX_NODES = 100000
+# Bytes aproximados por nodo (objeto con __slots__, lista de hijos y
+# entradas vigentes u obsoletas en los dos montículos), medidos con
+# tracemalloc con el tope lleno
+NODE_BYTES = 700
+INFINITY = float('inf')
+
+class Node:
+    __slots__ = ('state', 'g', 'h', 'f', 'depth', 'parent', 'direction', 'children', 'count', 'forgotten',
+                 'version', 'alive')
+
+    def __init__(self, state, g, h, f, depth, parent, direction):
+        self.state = state
+        self.g = g
+        self.h = h
+        self.f = f
+        self.depth = depth
+        self.parent = parent
+        self.direction = direction
+        self.children = None    # hijos en memoria por dirección (lista de 4)
+        self.count = 0
+        self.forgotten = INFINITY
+        self.version = 0
+        self.alive = True
+
+    # Prioridad para elegir el siguiente nodo: las hojas por su f y los
+    # nodos internos por la menor f de sus hijos olvidados
+    def key(self):
+        return self.forgotten if self.count else self.f
+
+# Algoritmo SMA*: devuelve el camino de estados empaquetados o None. El
+# tope se da en nodos (max_nodes) o en bytes (max_bytes, convertido con
+# NODE_BYTES). Con un Budget se cobra cada expansión como en los demás
+# motores.
+def sma_star_packed(start, goal, heuristic, size=3, max_nodes=None, max_bytes=None, stats=None, budget=None):
+    if max_nodes is None:
+        max_nodes = max_bytes // NODE_BYTES if max_bytes is not None else DEFAULT_MAX_NODES
+    if max_nodes < 2:
+        raise ValueError("SMA* necesita memoria para al menos dos nodos.")
+    h_full, h_update = packed_heuristic(heuristic, size)
+    h_full = timed(h_full, stats, 'heuristic_time')
+    h_update = timed(h_update, stats, 'heuristic_time')
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+    counter = count()
+    best_heap = []    # (clave, -profundidad, contador, versión, nodo)
+    worst_heap = []   # (-f, profundidad, contador, versión, nodo), solo hojas
+    h_start = h_full(start)
+    root = Node(start, 0, h_start, h_start, 0, None, None)
+    stored = 1
+    generated = 0
+
+    # Vuelve a poner un nodo en los montículos tras cambiar su clave; las
+    # entradas con otra versión quedan obsoletas
+    def touch(node):
+        node.version += 1
+        key = node.key()
+        if key < INFINITY:
+            heapq.heappush(best_heap, (key, -node.depth, next(counter), node.version, node))
+        if not node.count and node is not root:
+            heapq.heappush(worst_heap, (-node.f, node.depth, next(counter), node.version, node))
+
+    # Propaga hacia la raíz la f de un nodo interno
+    def backup(node):
+        while node is not None and node.count:
+            new_f = min(node.forgotten, min(child.f for child in node.children if child is not None))
+            if new_f == node.f:
+                return
+            node.f = new_f
+            node = node.parent
+
+    # Borra la peor hoja (sin tocar el nodo que se está expandiendo);
+    # devuelve False si no queda ninguna que borrar
+    def prune(expanding):
+        nonlocal stored
+        skipped = []
+        while worst_heap:
+            entry = heapq.heappop(worst_heap)
+            leaf = entry[4]
+            if not leaf.alive or entry[3] != leaf.version or leaf.count:
+                continue
+            if leaf is expanding:
+                skipped.append(entry)
+                continue
+            for entry in skipped:
+                heapq.heappush(worst_heap, entry)
+            leaf.alive = False
+            stored -= 1
+            parent = leaf.parent
+            parent.children[leaf.direction] = None
+            parent.count -= 1
+            parent.forgotten = min(parent.forgotten, leaf.f)
+            if not parent.count:
+                parent.f = parent.forgotten
+            touch(parent)
+            backup(parent)
+            return True
+        for entry in skipped:
+            heapq.heappush(worst_heap, entry)
+        return False
+
+    touch(root)
+    while best_heap:
+        key, _, _, version, node = heapq.heappop(best_heap)
+        if not node.alive or version != node.version:
+            continue
+
+        if node.state == goal:
+            if stats is not None:
+                stats.nodes_generated = generated
+                stats.finish(node.g)
+            return _path(node)
+
+        # Regenerar los hijos que no están en memoria; su f parte de la
+        # clave del nodo (pathmax), que ya incluye lo aprendido al olvidarlos
+        base = key
+        node.forgotten = INFINITY
+        node.version += 1
+        back = None if node.direction is None else node.direction ^ 1
+        if node.children is None:
+            node.children = [None] * 4
+        children = expand_packed(node.state, size)
+        generated += len(children)
+        for direction, tile, blank, child_state in children:
+            if direction == back or node.children[direction] is not None:
+                continue
+            h = h_update(node.h, tile, blank, direction) if h_update else h_full(child_state)
+            g = node.g + 1
+            # Un hijo que no es la meta a la profundidad máxima no puede
+            # llevar a una solución que quepa en memoria
+            if child_state != goal and node.depth + 2 >= max_nodes:
+                f = INFINITY
+            else:
+                f = max(base, g + h)
+            if stored >= max_nodes and not prune(node):
+                node.forgotten = min(node.forgotten, f)
+                continue
+            child = Node(child_state, g, h, f, node.depth + 1, node, direction)
+            node.children[direction] = child
+            node.count += 1
+            stored += 1
+            touch(child)
+        if not node.count:
+            node.f = node.forgotten
+        touch(node)
+        backup(node)
+        # Las entradas obsoletas de los montículos también ocupan memoria:
+        # si superan a los nodos guardados, se reconstruyen solo con las vigentes
+        if len(best_heap) + len(worst_heap) > 3 * stored + 64:
+            best_heap[:] = [e for e in best_heap if e[4].alive and e[3] == e[4].version]
+            worst_heap[:] = [e for e in worst_heap if e[4].alive and e[3] == e[4].version and not e[4].count]
+            heapq.heapify(best_heap)
+            heapq.heapify(worst_heap)
+
+        if stats is not None:
+            stats.nodes_generated = generated
+            stats.expanded(stored)
+        if budget is not None and budget.charge(stored):
+            if stats is not None:
+                stats.finish()
+            best = min((entry[4] for entry in best_heap if entry[4].alive and entry[3] == entry[4].version),
+                       key=lambda candidate: candidate.h, default=root)
+            raise budget.exceeded(lower_bound=root.f if root.f < INFINITY else None,
+                                  best_state=unpack_tiles(best.state, size), best_h=best.h,
+                                  moves=path_to_moves(_path(best), size))
+
+    if stats is not None:
+        stats.finish()
+    return None
+
+# Camino de estados desde la raíz hasta un nodo
+def _path(node):
+    path = []
+    while node is not None:
+        path.append(node.state)
+        node = node.parent
+    path.reverse()
+    return path
@@ -0,0 +1,258 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PuzzletBits import pack, board_size, standard_goal
+from PuzzletBatch import parse_board, _solve_chunk, check_options, hda_share, ENGINES, HEURISTIC_ENGINES
+from PuzzletCache import SolutionCache
+from PuzzletHeuristics import HEURISTICS
+from PuzzletSolvable import is_solvable
+
+# Servicio local de resolución: HTTP/1.1 con JSON sobre asyncio.
+#   POST /solve    {"board": "867254301", "engine": "a_star", "heuristic":
+#                   "manhattan", "goal": null, "weight": 1, "timeout": 10,
+#                   "max_nodes": null, "max_bytes": null}  (tope de SMA*)
+#   GET  /health   estado del servicio
+#   GET  /metrics  contadores, latencias y estado de la caché
+# Las búsquedas corren en un ProcessPoolExecutor que vive mientras dure el
+# servicio, así que las tablas y cachés de cada trabajador quedan calientes.
+# El motor hda reparte las CPU entre los trabajadores (hda_workers procesos
+# por búsqueda) en vez de lanzar uno por CPU en cada trabajador.
+# Los procesos se crean con 'spawn': con fork heredarían los sockets de las
+# conexiones abiertas y los clientes no verían nunca el cierre.
+# Las peticiones simultáneas por el mismo tablero y con el mismo plazo
+# comparten una sola búsqueda; si hay demasiadas búsquedas pendientes se
+# responde 503. Un fallo inesperado al resolver se responde con 500.
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+               504: 'Gateway Timeout'}
+MAX_BODY = 1 << 16
+
+class SolveService:
+    def __init__(self, workers=None, max_pending=64, default_timeout=30.0, cache_size=100000,
+                 worker_cache_size=10000, hda_workers=None, sma_max_nodes=None, sma_max_bytes=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.hda_workers = hda_workers or hda_share(self.workers)
+        self.sma_max_nodes = sma_max_nodes
+        self.sma_max_bytes = sma_max_bytes
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.worker_cache_size = worker_cache_size
+        self.cache = SolutionCache(cache_size)
+        self.executor = None
+        self.pending = {}    # clave de la búsqueda -> asyncio.Future compartido
+        self.started = time.time()
+        self.metrics = {'requests': 0, 'solved': 0, 'coalesced': 0, 'cache_hits': 0, 'rejected': 0,
+                        'timeouts': 0, 'budget_exceeded': 0, 'errors': 0}
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def start(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    # Resuelve una petición ya validada; devuelve (código HTTP, cuerpo)
+    async def solve(self, request):
+        board = parse_board(request['board'])
+        size = board_size(len(board))
+        goal = parse_board(request['goal']) if request.get('goal') is not None else standard_goal(size)
+        if len(goal) != len(board):
+            raise ValueError("El objetivo y el tablero tienen tamaños distintos.")
+        engine = request.get('engine', 'a_star')
+        heuristic = request.get('heuristic', 'manhattan')
+        weight = float(request.get('weight', 1))
+        timeout = float(request.get('timeout', self.default_timeout))
+        if engine not in ENGINES:
+            raise ValueError(f"Motor desconocido: {engine}")
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Heurística desconocida: {heuristic}")
+        # Los procesos de hda los fija el servicio; el tope de SMA* se puede
+        # pedir en cada petición
+        if engine == 'hda':
+            options = {'workers': self.hda_workers}
+        elif engine == 'sma':
+            options = {'max_nodes': request.get('max_nodes', self.sma_max_nodes),
+                       'max_bytes': request.get('max_bytes', self.sma_max_bytes)}
+        else:
+            options = {}
+        options = check_options(engine, options)
+
+        if not is_solvable(board, goal):
+            return 200, {'board': board, 'solvable': False, 'status': 'unsolvable', 'moves': None, 'length': None}
+
+        # Las soluciones óptimas se sirven desde la caché compartida
+        optimal = weight == 1
+        if optimal:
+            moves = self.cache.get(pack(board), pack(goal), size)
+            if moves is not None:
+                self.metrics['cache_hits'] += 1
+                return 200, {'board': board, 'solvable': True, 'status': 'solved', 'moves': moves,
+                             'length': len(moves), 'cached': True}
+
+        # El plazo es parte de la clave: la búsqueda usa el presupuesto de
+        # quien la inició, así que solo se comparte con peticiones del mismo plazo
+        key = (board, goal, engine, heuristic if engine in HEURISTIC_ENGINES else None, weight, timeout,
+               tuple(sorted(options.items())))
+        future = self.pending.get(key)
+        if future is not None:
+            self.metrics['coalesced'] += 1
+        else:
+            if len(self.pending) >= self.max_pending:
+                self.metrics['rejected'] += 1
+                return 503, {'error': "Demasiadas búsquedas pendientes; reintenta más tarde."}
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, _solve_chunk, [(0, board)], engine, heuristic, goal,
+                                          True, self.worker_cache_size, weight, {'time_limit': timeout}, options)
+            self.pending[key] = future
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+
+        try:
+            result = (await asyncio.wait_for(asyncio.shield(future), timeout))[0]
+        except asyncio.TimeoutError:
+            self.metrics['timeouts'] += 1
+            return 504, {'error': f"No se resolvió en {timeout} s."}
+        result = dict(result)
+        result.pop('index', None)
+        if result['status'] == 'error':
+            raise ValueError(result['error'])
+        if result['status'] == 'budget_exceeded':
+            self.metrics['budget_exceeded'] += 1
+        elif result['moves'] is not None and optimal:
+            self.cache.put_moves(pack(board), result['moves'], pack(goal), size)
+        return 200, result
+
+    def health(self):
+        return {'status': 'ok', 'uptime': time.time() - self.started, 'workers': self.workers,
+                'hda_workers': self.hda_workers}
+
+    def snapshot(self):
+        answered = self.metrics['requests'] - self.metrics['errors']
+        return dict(self.metrics, pending=len(self.pending), max_pending=self.max_pending,
+                    latency_avg=self.latency_total / answered if answered > 0 else 0.0,
+                    latency_max=self.latency_max, cache=self.cache.info())
+
+    # Atiende una petición HTTP ya leída
+    async def dispatch(self, method, path, body):
+        if path == '/health':
+            return (200, self.health()) if method == 'GET' else (405, {'error': "Usa GET."})
+        if path == '/metrics':
+            return (200, self.snapshot()) if method == 'GET' else (405, {'error': "Usa GET."})
+        if path != '/solve':
+            return 404, {'error': f"Ruta desconocida: {path}"}
+        if method != 'POST':
+            return 405, {'error': "Usa POST."}
+
+        self.metrics['requests'] += 1
+        started = time.perf_counter()
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict) or 'board' not in request:
+                raise ValueError("Falta el campo 'board'.")
+            status, payload = await self.solve(request)
+        except (ValueError, TypeError) as error:
+            self.metrics['errors'] += 1
+            return 400, {'error': str(error)}
+        except Exception as error:
+            self.metrics['errors'] += 1
+            return 500, {'error': f"Error interno: {error}"}
+        elapsed = time.perf_counter() - started
+        self.latency_total += elapsed
+        self.latency_max = max(self.latency_max, elapsed)
+        if status == 200 and payload.get('status') == 'solved':
+            self.metrics['solved'] += 1
+        return status, payload
+
+    # Conexión HTTP/1.1 con keep-alive: lee peticiones hasta que el cliente
+    # cierra o pide Connection: close
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self.respond(writer, 400, {'error': "Petición mal formada."}, close=True)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = headers.get('content-length', '0') or '0'
+                if not (length.isascii() and length.isdigit()):
+                    await self.respond(writer, 400, {'error': "Content-Length no válido."}, close=True)
+                    break
+                length = int(length)
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, {'error': "Cuerpo demasiado grande."}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.dispatch(method, path.split('?')[0], body)
+                close = headers.get('connection', '').lower() == 'close'
+                await self.respond(writer, status, payload, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, close=False):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'close' if close else 'keep-alive'}\r\n")
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+
+# Arranca el servicio y atiende hasta que se cancele; devuelve el servidor
+# asyncio para poder cerrarlo (p. ej. en pruebas sobre localhost)
+async def start_server(service, host='127.0.0.1', port=8080):
+    service.start()
+    return await asyncio.start_server(service.handle, host, port)
+
+async def serve(host='127.0.0.1', port=8080, **options):
+    service = SolveService(**options)
+    server = await start_server(service, host, port)
+    print(f"Servicio escuchando en http://{host}:{port} ({service.workers} procesos)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP local para resolver puzzles")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--max-pending', type=int, default=64)
+    parser.add_argument('--timeout', type=float, default=30.0, help="plazo por defecto de cada petición (s)")
+    parser.add_argument('--cache-size', type=int, default=100000)
+    parser.add_argument('--hda-workers', type=int,
+                        help="procesos de cada búsqueda hda (por defecto, las CPU repartidas entre --workers)")
+    parser.add_argument('--sma-max-nodes', type=int, help="tope de nodos de SMA* si la petición no da max_nodes")
+    parser.add_argument('--sma-max-bytes', type=int, help="tope de memoria de SMA* si la petición no da max_bytes")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_pending=args.max_pending,
+                          default_timeout=args.timeout, cache_size=args.cache_size,
+                          hda_workers=args.hda_workers, sma_max_nodes=args.sma_max_nodes,
+                          sma_max_bytes=args.sma_max_bytes))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,29 @@
+import numpy as np
+
+# Función para contar las inversiones de las fichas (ignorando el espacio vacío)
+def count_inversions(tiles):
+    values = [t for t in tiles if t != 0]
+    inversions = 0
+    for i in range(len(values)):
+        for j in range(i + 1, len(values)):
+            if values[i] > values[j]:
+                inversions += 1
+    return inversions
+
+# Verifica si un estado puede llegar al objetivo en un tablero N x N.
+# Con ancho impar basta comparar la paridad de las inversiones; con ancho par
+# se suma la fila del espacio vacío, porque un movimiento vertical cambia las
+# inversiones en N - 1 (impar) y la fila en 1.
+def is_solvable(state, goal):
+    tiles = [int(t) for t in np.asarray(state).ravel()]
+    goal_tiles = [int(t) for t in np.asarray(goal).ravel()]
+    if len(tiles) != len(goal_tiles) or sorted(tiles) != sorted(goal_tiles):
+        return False
+
+    size = int(round(len(tiles) ** 0.5))
+    parity = count_inversions(tiles) % 2
+    goal_parity = count_inversions(goal_tiles) % 2
+    if size % 2 == 0:
+        parity = (parity + tiles.index(0) // size) % 2
+        goal_parity = (goal_parity + goal_tiles.index(0) // size) % 2
+    return parity == goal_parity
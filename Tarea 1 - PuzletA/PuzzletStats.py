@@ -0,0 +1,92 @@
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Función para leer el máximo residente de todo el proceso desde que
+# arrancó, en bytes (None en Windows). ru_maxrss viene en bytes en macOS y en
+# KiB en Linux.
+def process_max_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+# Estadísticas de una búsqueda. Los motores reciben un SolveStats opcional y
+# lo van llenando; callback(stats) se llama cada `every` expansiones para
+# poder muestrear el progreso desde fuera.
+class SolveStats:
+    FIELDS = ('nodes_expanded', 'nodes_generated', 'duplicates_pruned', 'max_frontier',
+              'peak_memory', 'process_max_rss', 'heuristic_time', 'queue_time', 'wall_time', 'solution_length')
+
+    def __init__(self, callback=None, every=1000, track_memory=False):
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicates_pruned = 0
+        self.max_frontier = 0
+        self.peak_memory = None
+        self.process_max_rss = None
+        self.heuristic_time = 0.0
+        self.queue_time = 0.0
+        self.wall_time = 0.0
+        self.solution_length = None
+        self.callback = callback
+        self.every = every
+        self.track_memory = track_memory
+        self._started = None
+        self._tracing = False    # True si start() fue quien encendió tracemalloc
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        return self
+
+    # Registra una expansión y dispara el callback cada `every` expansiones
+    def expanded(self, frontier_size=0):
+        self.nodes_expanded += 1
+        if frontier_size > self.max_frontier:
+            self.max_frontier = frontier_size
+        if self.callback is not None and self.nodes_expanded % self.every == 0:
+            self.wall_time = time.perf_counter() - self._started
+            self.callback(self)
+
+    def finish(self, solution_length=None):
+        self.wall_time = time.perf_counter() - self._started
+        self.solution_length = solution_length
+        # peak_memory: memoria pico de esta búsqueda (tracemalloc, en bytes),
+        # solo con track_memory. process_max_rss: máximo residente de todo el
+        # proceso desde que arrancó, no de esta búsqueda. tracemalloc solo se
+        # apaga si lo encendió start(), no si ya lo usaba quien llama
+        if self.track_memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+        self.process_max_rss = process_max_rss()
+        return self
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return "SolveStats(" + ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items()) + ")"
+
+# Función para envolver una función de modo que sume su tiempo de ejecución
+# al campo indicado de stats (p. ej. 'heuristic_time' o 'queue_time'). Sin
+# stats devuelve la función tal cual, así que no cuesta nada.
+def timed(func, stats, field):
+    if stats is None or func is None:
+        return func
+
+    def wrapper(*args):
+        started = time.perf_counter()
+        result = func(*args)
+        setattr(stats, field, getattr(stats, field) + time.perf_counter() - started)
+        return result
+    return wrapper
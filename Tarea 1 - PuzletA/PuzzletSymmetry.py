@@ -0,0 +1,115 @@
+from PuzzletBits import tile_bits, board_size, DIRECTIONS
+
+# Las 8 simetrías del cuadrado como funciones (fila, columna) -> (fila,
+# columna) sobre un tablero de lado n + 1
+SQUARE_MAPS = [
+    lambda r, c, n: (r, c),            # identidad
+    lambda r, c, n: (c, r),            # trasponer
+    lambda r, c, n: (n - c, n - r),    # trasponer por la antidiagonal
+    lambda r, c, n: (n - r, n - c),    # girar 180°
+    lambda r, c, n: (r, n - c),        # espejo horizontal
+    lambda r, c, n: (n - r, c),        # espejo vertical
+    lambda r, c, n: (c, n - r),        # girar 90°
+    lambda r, c, n: (n - c, r),        # girar 270°
+]
+
+LETTERS = ''.join(letter for _, _, letter in DIRECTIONS)
+
+# Simetrías de un objetivo. Una simetría del cuadrado que deja la casilla del
+# vacío del objetivo en su sitio, junto con el cambio de nombre de fichas
+# relabel[goal[p]] = goal[perm[p]], lleva el objetivo en sí mismo; por eso un
+# tablero y su imagen tienen el mismo costo óptimo, y la solución de uno se
+# obtiene de la del otro cambiando las direcciones del vacío. Con el objetivo
+# estándar (vacío en una esquina) la única simetría no trivial es trasponer.
+class Symmetry:
+    def __init__(self, goal):
+        self.goal = tuple(int(t) for t in goal)
+        self.cells = len(self.goal)
+        self.size = board_size(self.cells)
+        n = self.size - 1
+        blank = self.goal.index(0)
+        # Cada simetría: (origen de cada casilla, cambio de nombre, direcciones)
+        self.maps = []
+        for square_map in SQUARE_MAPS:
+            perm = [square_map(*divmod(p, self.size), n) for p in range(self.cells)]
+            perm = [r * self.size + c for r, c in perm]
+            if perm[blank] != blank:
+                continue
+            source = [0] * self.cells
+            for p, q in enumerate(perm):
+                source[q] = p
+            relabel = [0] * self.cells
+            for p in range(self.cells):
+                relabel[self.goal[p]] = self.goal[perm[p]]
+            # Una dirección (dr, dc) del vacío se convierte en la diferencia
+            # de las imágenes de dos casillas vecinas
+            directions = []
+            for dr, dc, _ in DIRECTIONS:
+                r0, c0 = square_map(1, 1, 2)
+                r1, c1 = square_map(1 + dr, 1 + dc, 2)
+                directions.append(next(d for d, (er, ec, _) in enumerate(DIRECTIONS)
+                                       if (er, ec) == (r1 - r0, c1 - c0)))
+            inverse = [directions.index(d) for d in range(4)]
+            self.maps.append((source, relabel, directions, inverse))
+        self.bits = tile_bits(self.size)
+
+    def __len__(self):
+        return len(self.maps)
+
+    # Imagen de una tupla de fichas por la simetría número index
+    def image(self, tiles, index):
+        source, relabel, _, _ = self.maps[index]
+        return tuple(relabel[tiles[p]] for p in source)
+
+    # Representante canónico (el menor empaquetado de todas las imágenes) de
+    # un estado empaquetado; devuelve (canónico, índice de la simetría)
+    def canonical(self, packed):
+        if len(self.maps) == 1:
+            return packed, 0
+        bits, mask, cells = self.bits, (1 << self.bits) - 1, self.cells
+        tiles = [(packed >> (bits * i)) & mask for i in range(cells)]
+        best, best_index = packed, 0
+        for index in range(1, len(self.maps)):
+            source, relabel, _, _ = self.maps[index]
+            image = 0
+            for q in range(cells):
+                tile = relabel[tiles[source[q]]]
+                image |= tile << (bits * q)
+                if tile == 0:
+                    blank = q
+            image |= blank << (bits * cells)
+            if image < best:
+                best, best_index = image, index
+        return best, best_index
+
+    # Todas las imágenes distintas de un estado empaquetado
+    def images(self, packed):
+        bits, mask, cells = self.bits, (1 << self.bits) - 1, self.cells
+        tiles = [(packed >> (bits * i)) & mask for i in range(cells)]
+        result = {packed}
+        for index in range(1, len(self.maps)):
+            image = self.image(tiles, index)
+            value = image.index(0) << (bits * cells)
+            for q, tile in enumerate(image):
+                value |= tile << (bits * q)
+            result.add(value)
+        return result
+
+    # Movimientos del vacío ("ULDR...") llevados por la simetría index
+    def map_moves(self, moves, index):
+        directions = self.maps[index][2]
+        return ''.join(LETTERS[directions[LETTERS.index(m)]] for m in moves)
+
+    # Movimientos de la imagen devueltos al tablero original
+    def unmap_moves(self, moves, index):
+        inverse = self.maps[index][3]
+        return ''.join(LETTERS[inverse[LETTERS.index(m)]] for m in moves)
+
+_symmetries = {}
+
+# Función para obtener (y reutilizar) las simetrías de un objetivo
+def get_symmetry(goal):
+    goal = tuple(int(t) for t in goal)
+    if goal not in _symmetries:
+        _symmetries[goal] = Symmetry(goal)
+    return _symmetries[goal]
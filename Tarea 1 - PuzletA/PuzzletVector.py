@@ -0,0 +1,142 @@
+import heapq
+import numpy as np
+from PuzzletBits import pack, apply_move, board_size, path_to_came_from
+from PuzzletHeuristics import OFFSETS, get_heuristic
+from PuzzletStats import timed
+
+_neighbor_tables = {}
+
+# Función para construir la tabla de vecinos del vacío como ndarray
+# (celdas, 4): casilla destino por dirección, o -1 si se sale del tablero
+def neighbor_table(size=3):
+    if size not in _neighbor_tables:
+        table = np.full((size * size, 4), -1, dtype=np.int64)
+        for pos in range(size * size):
+            x, y = divmod(pos, size)
+            for direction, (dx, dy) in enumerate(OFFSETS):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    table[pos, direction] = (x + dx) * size + y + dy
+        _neighbor_tables[size] = table
+    return _neighbor_tables[size]
+
+# Función para generar en bloque los hijos de k tableros (k, celdas): devuelve
+# los hijos (m, celdas), el índice del padre y el código de movimiento
+def expand_batch(boards, blanks, size=3):
+    targets = neighbor_table(size)[blanks]            # (k, 4)
+    parents, directions = np.nonzero(targets >= 0)
+    children = boards[parents].copy()
+    rows = np.arange(parents.size)
+    moved = targets[parents, directions]
+    children[rows, blanks[parents]] = children[rows, moved]
+    children[rows, moved] = 0
+    return children, parents, directions
+
+# Función para obtener las claves (bytes) de cada fila sin un bucle Python
+def row_keys(boards):
+    boards = np.ascontiguousarray(boards)
+    return boards.view(np.dtype((np.void, boards.shape[1]))).ravel().tolist()
+
+# Algoritmo A* con expansión vectorizada: saca hasta batch_size nodos de la
+# frontera, genera todos sus hijos como un solo ndarray y calcula la
+# heurística de todos con heuristic.batch(). Como el bloque no siempre está
+# en orden exacto de f, se permite reabrir nodos y se termina cuando ningún
+# nodo abierto puede mejorar la mejor solución encontrada. Las claves son los
+# bytes del tablero (uint8), así que no se guarda ningún ndarray por estado, y
+# came_from solo guarda el código del movimiento. Devuelve el camino de
+# estados empaquetados o None. Con un Budget, al agotarlo lanza
+# BudgetExceeded con la menor f abierta (cota inferior) y la mejor solución
+# encontrada hasta entonces, si la hay (cota superior).
+def a_star_vectorized_path(initial_state, goal_state, heuristic='manhattan', batch_size=64, stats=None,
+                           budget=None):
+    initial_state = np.asarray(initial_state)
+    cells = initial_state.size
+    size = board_size(cells)
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic, goal_state)
+    h_batch = timed(heuristic.batch, stats, 'heuristic_time')
+    pop = timed(heapq.heappop, stats, 'queue_time')
+    push = timed(heapq.heappush, stats, 'queue_time')
+    if stats is not None:
+        stats.start()
+    if budget is not None:
+        budget.start()
+
+    start = initial_state.ravel().astype(np.uint8)
+    goal_key = row_keys(np.asarray(goal_state).reshape((1, cells)).astype(np.uint8))[0]
+    start_key = row_keys(start.reshape((1, cells)))[0]
+    came_from = {start_key: None}
+    cost_so_far = {start_key: 0}
+    pq = [(int(h_batch(start.reshape((1, cells)))[0]), 0, start_key)]
+    best = float('inf') if start_key != goal_key else 0
+
+    while pq and pq[0][0] < best:
+        batch = []
+        while pq and len(batch) < batch_size:
+            f, g, key = pop(pq)
+            if g == cost_so_far[key] and f < best:
+                if not batch:
+                    lowest = f
+                batch.append(key)
+            elif stats is not None:
+                stats.duplicates_pruned += 1
+        if not batch:
+            continue
+
+        parent_boards = np.frombuffer(b''.join(batch), dtype=np.uint8).reshape((len(batch), cells))
+        blanks = np.argmax(parent_boards == 0, axis=1)
+        children, parents, directions = expand_batch(parent_boards, blanks, size)
+        h = h_batch(children).tolist()
+        keys = row_keys(children)
+        if stats is not None:
+            stats.nodes_generated += len(keys)
+            for _ in batch:
+                stats.expanded(len(pq))
+        if budget is not None and any(budget.charge(len(pq)) for _ in batch):
+            if stats is not None:
+                stats.finish()
+            raise budget.exceeded(lower_bound=min(lowest, best),
+                                  upper_bound=None if best == float('inf') else best)
+
+        parents = parents.tolist()
+        directions = directions.tolist()
+        for i, key in enumerate(keys):
+            new_cost = cost_so_far[batch[parents[i]]] + 1
+            if key not in cost_so_far or new_cost < cost_so_far[key]:
+                cost_so_far[key] = new_cost
+                came_from[key] = directions[i]
+                if key == goal_key:
+                    best = min(best, new_cost)
+                else:
+                    push(pq, (new_cost + h[i], new_cost, key))
+            elif stats is not None:
+                stats.duplicates_pruned += 1
+
+    if best == float('inf'):
+        if stats is not None:
+            stats.finish()
+        return None
+    if stats is not None:
+        stats.finish(best)
+
+    # Retroceder desde la meta con los códigos y reproducir hacia adelante
+    codes = []
+    current = goal_key
+    while came_from[current] is not None:
+        code = came_from[current]
+        codes.append(code)
+        board = np.frombuffer(current, dtype=np.uint8).copy()
+        blank = int(np.argmax(board == 0))
+        source = neighbor_table(size)[blank, code ^ 1]
+        board[blank], board[source] = board[source], 0
+        current = board.tobytes()
+    path = [pack(start)]
+    for code in reversed(codes):
+        path.append(apply_move(path[-1], code, size))
+    return path
+
+# A* vectorizado con la misma forma de llamada que a_star; devuelve
+# (came_from, cost_so_far) compatible con reconstruct_path
+def a_star_vectorized(initial_state, goal_state, heuristic='manhattan', batch_size=64, stats=None, budget=None):
+    initial_state = np.asarray(initial_state)
+    path = a_star_vectorized_path(initial_state, goal_state, heuristic, batch_size, stats, budget)
+    return path_to_came_from(path, board_size(initial_state.size), initial_state.dtype)
@@ -0,0 +1,43 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Los módulos Puzzlet*.py se importan entre sí como hermanos, así que las
+# pruebas agregan la carpeta de la tarea al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PuzzletBits import pack, standard_goal, neighbors_packed  # noqa: E402
+from PuzzletBench import random_walk  # noqa: E402
+from PuzzletOracle import get_oracle, oracle_distance  # noqa: E402
+
+SEED = 1234
+DEPTHS = (0, 1, 5, 10, 15, 20, 25)
+
+# Corpus fijo de tableros 3x3 (paseos aleatorios con semilla) con su
+# distancia óptima según el oráculo
+@pytest.fixture(scope='session')
+def corpus():
+    rng = random.Random(SEED)
+    table = get_oracle()
+    boards = [random_walk(rng, depth) for depth in DEPTHS for _ in range(2)]
+    boards.append((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    return [(board, oracle_distance(table, pack(board))) for board in boards]
+
+@pytest.fixture(scope='session')
+def goal():
+    return standard_goal(3)
+
+# Comprueba que un camino de estados empaquetados va del tablero al objetivo
+# con movimientos legales y tiene el largo óptimo
+@pytest.fixture(scope='session')
+def assert_optimal_path(goal):
+    def check(path, board, optimal):
+        assert path is not None
+        assert path[0] == pack(board)
+        assert path[-1] == pack(goal)
+        for state, following in zip(path, path[1:]):
+            assert following in neighbors_packed(state)
+        assert len(path) - 1 == optimal
+    return check
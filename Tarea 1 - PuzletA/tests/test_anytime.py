@@ -0,0 +1,23 @@
+from PuzzletBits import pack
+from PuzzletAnytime import ara_star_packed
+from PuzzletBatch import solve_board
+from PuzzletHeuristics import get_heuristic
+
+
+def test_ara_star_ends_with_an_optimal_path(corpus, goal, assert_optimal_path):
+    heuristic = get_heuristic('manhattan', goal)
+    for board, optimal in corpus:
+        solutions = list(ara_star_packed(pack(board), pack(goal), heuristic))
+        costs = [cost for _, cost, _ in solutions]
+        assert costs == sorted(costs, reverse=True)
+        for path, cost, bound in solutions:
+            assert optimal <= cost <= bound * optimal
+        path, cost, bound = solutions[-1]
+        assert bound == 1.0
+        assert_optimal_path(path, board, optimal)
+
+
+def test_weighted_a_star_stays_within_its_bound(corpus):
+    for board, optimal in corpus:
+        result = solve_board(board, 'a_star', 'manhattan', weight=2)
+        assert optimal <= result['length'] <= 2 * optimal
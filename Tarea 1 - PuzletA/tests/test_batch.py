@@ -0,0 +1,23 @@
+from PuzzletBatch import solve_many, solve_board
+
+
+def test_solve_many_keeps_input_order_and_error_placeholders(corpus):
+    boards = [board for board, _ in corpus]
+    boards.insert(3, None)
+    results = list(solve_many(boards, workers=2, chunksize=2, ordered=True))
+    assert [result['index'] for result in results] == list(range(len(boards)))
+    assert results[3]['status'] == 'error'
+    lengths = [result['length'] for result in results if result['status'] == 'solved']
+    assert lengths == [optimal for _, optimal in corpus]
+
+
+def test_solve_many_unordered_returns_every_board(corpus):
+    boards = [board for board, _ in corpus]
+    results = list(solve_many(boards, workers=2, chunksize=1))
+    assert sorted(result['index'] for result in results) == list(range(len(boards)))
+
+
+def test_unsolvable_board_is_reported():
+    result = solve_board((2, 1, 3, 4, 5, 6, 7, 8, 0))
+    assert result['status'] == 'unsolvable'
+    assert result['moves'] is None
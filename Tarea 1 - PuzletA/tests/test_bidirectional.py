@@ -0,0 +1,11 @@
+import pytest
+
+from PuzzletBits import pack
+from PuzzletBidir import bidirectional_packed
+
+
+@pytest.mark.parametrize('symmetric', [False, True])
+def test_bidirectional_search_is_optimal(symmetric, corpus, goal, assert_optimal_path):
+    for board, optimal in corpus:
+        path = bidirectional_packed(pack(board), pack(goal), symmetric=symmetric)
+        assert_optimal_path(path, board, optimal)
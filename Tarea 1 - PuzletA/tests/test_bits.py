@@ -0,0 +1,43 @@
+import random
+
+from PuzzletBits import (pack, unpack_tiles, apply_move, blank_index, neighbors_packed, a_star_packed,
+                         reconstruct_packed, standard_goal, path_to_moves)
+from PuzzletBench import random_walk
+from PuzzletHeuristics import get_heuristic
+
+
+def test_pack_round_trip():
+    rng = random.Random(1)
+    for size in (3, 4, 5):
+        for depth in (0, 7, 40):
+            tiles = random_walk(rng, depth, size)
+            packed = pack(tiles)
+            assert unpack_tiles(packed, size) == tuple(tiles)
+            assert blank_index(packed, size) == tiles.index(0)
+
+
+def test_apply_move_is_undone_by_the_opposite_move():
+    state = pack((1, 2, 3, 4, 0, 5, 6, 7, 8))
+    for neighbor in neighbors_packed(state):
+        assert state in neighbors_packed(neighbor)
+    for direction in range(4):
+        assert apply_move(apply_move(state, direction), direction ^ 1) == state
+
+
+def test_a_star_packed_is_optimal(corpus, goal, assert_optimal_path):
+    heuristic = get_heuristic('manhattan', goal)
+    for queue in ('bucket', 'heap'):
+        for board, optimal in corpus:
+            came_from, _ = a_star_packed(pack(board), pack(goal), heuristic, queue=queue)
+            path = reconstruct_packed(came_from, pack(board), pack(goal))
+            assert_optimal_path(path, board, optimal)
+            assert len(path_to_moves(path)) == optimal
+
+
+def test_a_star_packed_on_4x4():
+    goal = standard_goal(4)
+    board = random_walk(random.Random(7), 12, 4)
+    heuristic = get_heuristic('manhattan', goal)
+    came_from, cost = a_star_packed(pack(board), pack(goal), heuristic, size=4)
+    assert cost[pack(goal)] <= 12
+    assert reconstruct_packed(came_from, pack(board), pack(goal), 4)[-1] == pack(goal)
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from PuzzletBatch import solve_board
+from PuzzletBudget import Budget, CancelToken
+
+HARDEST = (8, 6, 7, 2, 5, 4, 3, 0, 1)
+
+
+@pytest.mark.parametrize('engine', ['a_star', 'ida_star', 'dense', 'sma'])
+def test_node_budget_returns_partial_progress(engine):
+    result = solve_board(HARDEST, engine, budget={'max_expanded': 100})
+    assert result['status'] == 'budget_exceeded'
+    assert result['reason'] == 'nodes'
+    assert result['moves'] is None
+    partial = result['partial']
+    assert partial['expanded'] == 101
+    assert 0 < partial['lower_bound'] <= 31
+
+
+def test_budget_large_enough_lets_the_search_finish():
+    result = solve_board(HARDEST, 'a_star', budget={'max_expanded': 10 ** 6})
+    assert result['status'] == 'solved' and result['length'] == 31
+
+
+def test_cancel_from_a_timer_thread():
+    token = CancelToken()
+    timer = threading.Timer(0.2, token.cancel)
+    started = time.perf_counter()
+    timer.start()
+    try:
+        # IDA* con Hamming tarda mucho más que el temporizador en este tablero
+        result = solve_board(HARDEST, 'ida_star', 'hamming', budget=Budget(token=token, check_every=64))
+    finally:
+        timer.cancel()
+    assert result['status'] == 'budget_exceeded'
+    assert result['reason'] == 'cancelled'
+    assert time.perf_counter() - started < 10
+
+
+def test_time_limit():
+    result = solve_board(HARDEST, 'ida_star', 'hamming', budget={'time_limit': 0.1, 'check_every': 64})
+    assert result['reason'] == 'time'
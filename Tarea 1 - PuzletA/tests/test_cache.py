@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from PuzzletBits import pack, apply_move
+from PuzzletBatch import solve_board
+from PuzzletCache import SolutionCache
+from PuzzletSymmetry import get_symmetry, LETTERS
+
+
+# Aplica una cadena de movimientos ("ULDR...") a un estado empaquetado
+def play(state, moves):
+    for move in moves:
+        state = apply_move(state, LETTERS.index(move))
+    return state
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = SolutionCache(maxsize=2, symmetric=False)
+    cache.put(1, 0, 'U')
+    cache.put(2, 0, 'D')
+    assert cache.get(1, 0) == 'U'
+    cache.put(3, 0, 'L')
+    assert cache.get(2, 0) is None
+    assert cache.get(1, 0) == 'U' and cache.get(3, 0) == 'L'
+    info = cache.info()
+    assert info['evictions'] == 1 and info['size'] == 2
+    assert info['hits'] == 3 and info['misses'] == 1
+
+
+def test_every_state_on_a_cached_path_gets_its_suffix(corpus, goal):
+    cache = SolutionCache(symmetric=False)
+    board, optimal = corpus[-1]
+    moves = solve_board(board, cache=cache)['moves']
+    assert len(moves) == optimal
+    state = pack(board)
+    for i in range(len(moves) + 1):
+        assert cache.get(state, pack(goal)) == moves[i:]
+        if i < len(moves):
+            state = play(state, moves[i])
+    assert solve_board(board, cache=cache)['cached']
+
+
+def test_save_and_load_round_trip(corpus, goal, tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = SolutionCache(path=path)
+    for board, _ in corpus:
+        solve_board(board, cache=cache)
+    cache.save()
+    loaded = SolutionCache(path=path)
+    assert loaded.entries == cache.entries
+    with open(path) as f:
+        assert json.load(f)['format'] == 'puzzlet-cache-2'
+
+
+def test_format_1_files_load_as_non_symmetric(tmp_path):
+    path = str(tmp_path / 'old.json')
+    with open(path, 'w') as f:
+        json.dump({'format': 'puzzlet-cache-1', 'entries': [[7, 5, 'UL']]}, f)
+    assert SolutionCache(path=path, symmetric=False).get(5, 7) == 'UL'
+    with pytest.raises(ValueError):
+        SolutionCache(path=path, symmetric=True)
+
+
+def test_symmetric_cache_answers_the_transposed_board(corpus, goal):
+    symmetry = get_symmetry(goal)
+    assert len(symmetry) > 1
+    cache = SolutionCache()
+    for board, optimal in corpus:
+        solve_board(board, cache=cache)
+        image = symmetry.image(board, 1)
+        moves = cache.get(pack(image), pack(goal))
+        assert moves is not None and len(moves) == optimal
+        assert play(pack(image), moves) == pack(goal)
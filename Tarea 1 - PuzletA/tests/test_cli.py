@@ -0,0 +1,43 @@
+import io
+import json
+
+import pytest
+
+import PuzzletCLI
+
+LINES = [
+    '# comentario\n',
+    '867254301\n',
+    'no es un tablero\n',
+    '{"id": "b", "board": [1, 2, 3, 4, 5, 6, 7, 0, 8]}\n',
+    '\n',
+    '1 2 3 4 5 6 7 8 9 10 11 12 13 14 0 15\n',
+    '213456780\n',
+]
+
+
+def run_cli(argv, lines=LINES):
+    out = io.StringIO()
+    PuzzletCLI.run(PuzzletCLI.build_parser().parse_args(argv), iter(lines), out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize('argv', [[], ['-j', '2', '--chunksize', '1']])
+def test_mixed_lines_come_out_in_input_order(argv):
+    records = run_cli(['-e', 'dense'] + argv)
+    assert [record['line'] for record in records] == [2, 3, 4, 6, 7]
+    assert [record['status'] for record in records] == ['solved', 'error', 'solved', 'error', 'unsolvable']
+    assert records[0]['length'] == 31
+    assert records[2]['id'] == 'b' and records[2]['moves'] == 'R'
+    assert 'error' in records[1] and 'error' in records[3]
+
+
+def test_unordered_mode_writes_every_line():
+    records = run_cli(['-j', '2', '--chunksize', '1', '--unordered'])
+    assert sorted(record['line'] for record in records) == [2, 3, 4, 6, 7]
+
+
+def test_invalid_option_combinations_are_rejected():
+    for argv in (['--weight', '2', '-e', 'ida_star'], ['--hda-workers', '2'], ['-e', 'sma', '--sma-max-nodes', '0']):
+        with pytest.raises(SystemExit):
+            PuzzletCLI.main(argv + ['-'])
@@ -0,0 +1,19 @@
+import pytest
+
+from PuzzletBits import pack, standard_goal
+from PuzzletDense import a_star_dense
+from PuzzletHeuristics import get_heuristic
+
+
+@pytest.mark.parametrize('queue', ['bucket', 'heap'])
+def test_dense_a_star_is_optimal(queue, corpus, goal, assert_optimal_path):
+    heuristic = get_heuristic('manhattan', goal)
+    for board, optimal in corpus:
+        path = a_star_dense(pack(board), pack(goal), heuristic, queue=queue)
+        assert_optimal_path(path, board, optimal)
+
+
+def test_dense_a_star_rejects_boards_larger_than_3x3():
+    goal = standard_goal(4)
+    with pytest.raises(ValueError):
+        a_star_dense(pack(goal), pack(goal), get_heuristic('manhattan', goal), size=4)
@@ -0,0 +1,28 @@
+import pytest
+
+from PuzzletBits import pack
+from PuzzletBatch import solve_board, hda_share
+from PuzzletHDA import hda_star_packed, owner
+from PuzzletHeuristics import get_heuristic
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_hda_star_is_optimal(workers, corpus, goal, assert_optimal_path):
+    heuristic = get_heuristic('manhattan', goal)
+    for board, optimal in corpus:
+        path = hda_star_packed(pack(board), pack(goal), heuristic, workers=workers)
+        assert_optimal_path(path, board, optimal)
+
+
+def test_owner_spreads_states_over_workers(corpus):
+    owners = {owner(pack(board), 3) for board, _ in corpus}
+    assert owners <= {0, 1, 2}
+    assert len(owners) > 1
+
+
+def test_hda_workers_option_and_pool_share():
+    result = solve_board((8, 6, 7, 2, 5, 4, 3, 0, 1), 'hda', options={'workers': 2})
+    assert result['length'] == 31
+    assert hda_share(10 ** 6) == 1
+    with pytest.raises(ValueError):
+        solve_board((1, 2, 3, 4, 5, 6, 7, 0, 8), 'a_star', options={'workers': 2})
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+import pytest
+
+from PuzzletBits import pack, unpack_tiles, expand_packed, standard_goal
+from PuzzletBench import random_walk
+from PuzzletHeuristics import HEURISTICS, get_heuristic
+
+
+@pytest.mark.parametrize('size', [3, 4])
+@pytest.mark.parametrize('name', ['hamming', 'manhattan'])
+def test_incremental_update_matches_evaluate(name, size):
+    goal = standard_goal(size)
+    heuristic = get_heuristic(name, goal)
+    state = pack(goal)
+    h = heuristic.evaluate(goal)
+    # Paseo determinista: en cada paso el primer hijo que no deshace el anterior
+    previous = None
+    for _ in range(60):
+        for direction, tile, blank, child in expand_packed(state, size):
+            if previous is None or direction != previous ^ 1:
+                break
+        h = heuristic.update(h, tile, blank, direction)
+        state, previous = child, direction
+        assert h == heuristic.evaluate(unpack_tiles(state, size))
+
+
+def test_non_incremental_heuristics_have_no_update(goal):
+    for name in ('linear_conflict', 'walking_distance'):
+        assert getattr(get_heuristic(name, goal), 'update', None) is None
+
+
+@pytest.mark.parametrize('name', list(HEURISTICS))
+def test_heuristics_are_admissible_and_batch_matches(name, corpus, goal):
+    heuristic = get_heuristic(name, goal)
+    boards = np.array([board for board, _ in corpus])
+    values = [heuristic.evaluate(board) for board, _ in corpus]
+    for value, (board, optimal) in zip(values, corpus):
+        assert 0 <= value <= optimal
+        assert (value == 0) == (optimal == 0)
+    assert list(heuristic.batch(boards)) == values
+
+
+def test_linear_conflict_memo_stays_bounded():
+    goal = standard_goal(5)
+    heuristic = get_heuristic('linear_conflict', goal)
+    rng = random.Random(8)
+    for _ in range(500):
+        heuristic.evaluate(random_walk(rng, 200, 5))
+    # Secuencias de metas distintas de largo <= 5: sum(5! / (5 - k)!) = 326
+    assert len(heuristic.memo) <= 326
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+import PuzzletOracle
+from PuzzletBits import pack
+from PuzzletBatch import solve_board
+from PuzzletOracle import get_oracle, oracle_distance, oracle_path, save_oracle, load_oracle, build_oracle
+
+
+def test_oracle_is_mapped_once_per_process(goal):
+    assert get_oracle(goal) is get_oracle(goal)
+
+
+def test_oracle_for_another_goal_uses_its_own_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(PuzzletOracle, 'DIRECTORY', str(tmp_path))
+    other = (0, 1, 2, 3, 4, 5, 6, 7, 8)
+    path = oracle_path(other)
+    assert path != oracle_path()
+    table = get_oracle(other)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    assert oracle_distance(table, pack(other)) == 0
+    result = solve_board((1, 0, 2, 3, 4, 5, 6, 7, 8), 'oracle', goal=other)
+    assert result['moves'] == 'L'
+
+
+def test_truncated_oracle_is_rejected(goal, tmp_path):
+    path = str(tmp_path / 'oracle.bin')
+    save_oracle(build_oracle(goal), goal, path)
+    with open(path, 'r+b') as f:
+        f.truncate(1000)
+    with pytest.raises(ValueError):
+        load_oracle(path)
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from PuzzletPDB import build_pattern, save_pattern, load_pattern, pattern_path, get_pattern_database
+
+
+def test_saved_pattern_round_trips_and_truncated_files_are_rejected(goal, tmp_path):
+    pattern = (1, 2, 3)
+    table = build_pattern(goal, pattern)
+    path = pattern_path(3, pattern, str(tmp_path))
+    save_pattern(table, goal, pattern, path)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+    loaded_goal, loaded_pattern, loaded = load_pattern(path)
+    assert loaded_goal == goal and loaded_pattern == pattern
+    assert list(loaded) == list(table)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        load_pattern(path)
+
+
+def test_building_on_demand_keeps_stdout_clean(goal, tmp_path, capsys):
+    database = get_pattern_database(goal, directory=str(tmp_path))
+    assert database.evaluate(goal) == 0
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'Construyendo' in captured.err
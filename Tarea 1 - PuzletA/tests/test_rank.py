@@ -0,0 +1,53 @@
+import random
+from itertools import permutations
+
+import numpy as np
+
+from PuzzletBits import pack, expand_packed, standard_goal
+from PuzzletBench import random_walk
+from PuzzletRank import (rank_permutation, unrank_permutation, rank_state, rank_packed, rank_after_move,
+                         state_space_size, table_size, rank_positions, unrank_positions)
+
+
+def test_permutation_rank_round_trip():
+    for n in (1, 4, 6):
+        ranks = [rank_permutation(perm) for perm in permutations(range(n))]
+        assert ranks == list(range(len(ranks)))
+        for rank in ranks:
+            assert rank_permutation(unrank_permutation(rank, n)) == rank
+
+
+def test_state_ranks_are_dense_and_match_packed():
+    # Todos los estados alcanzables del 2x2 llenan el índice sin huecos
+    goal = pack(standard_goal(2))
+    seen, frontier = {goal}, [goal]
+    while frontier:
+        frontier = [child for state in frontier for _, _, _, child in expand_packed(state, 2) if child not in seen]
+        seen.update(frontier)
+    assert sorted(rank_packed(state, 2) for state in seen) == list(range(state_space_size(4)))
+
+    rng = random.Random(3)
+    for size in (3, 4):
+        for depth in (0, 5, 50):
+            tiles = random_walk(rng, depth, size)
+            assert rank_state(list(tiles)) == rank_packed(pack(tiles), size)
+            assert 0 <= rank_packed(pack(tiles), size) < state_space_size(size * size)
+
+
+def test_rank_after_move_matches_full_rank():
+    rng = random.Random(4)
+    for size in (3, 4):
+        for _ in range(20):
+            state = pack(random_walk(rng, 30, size))
+            index = rank_packed(state, size)
+            for direction, _, _, child in expand_packed(state, size):
+                assert rank_after_move(index, direction, child, size) == rank_packed(child, size)
+
+
+def test_position_rank_round_trip():
+    cells, k = 9, 3
+    index = np.arange(table_size(cells, k))
+    positions = unrank_positions(index, cells, k)
+    assert len({tuple(p) for p in positions}) == len(index)
+    assert list(rank_positions(positions, cells)) == list(index)
+    assert rank_positions(positions[17], cells) == 17
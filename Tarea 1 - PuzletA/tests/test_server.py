@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from PuzzletServer import SolveService, start_server
+
+HARDEST = '867254301'
+
+
+# Envía una petición HTTP/1.1 y devuelve (código, cuerpo JSON)
+async def request(port, method, path, payload=None, raw_body=None, length=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = raw_body if raw_body is not None else (json.dumps(payload).encode() if payload is not None else b'')
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nConnection: close\r\nContent-Length: {length}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+
+# Arranca un servicio en un puerto libre, ejecuta scenario(service, port) y
+# lo cierra
+def run_service(scenario, **options):
+    async def main():
+        service = SolveService(workers=1, **options)
+        server = await start_server(service, port=0)
+        try:
+            return await scenario(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(main())
+
+
+def test_health_metrics_and_routes():
+    async def scenario(service, port):
+        status, health = await request(port, 'GET', '/health')
+        assert status == 200 and health['status'] == 'ok'
+        status, solved = await request(port, 'POST', '/solve', {'board': '123456708'})
+        assert status == 200 and solved['moves'] == 'R'
+        status, cached = await request(port, 'POST', '/solve', {'board': '123456708'})
+        assert cached['cached']
+        status, metrics = await request(port, 'GET', '/metrics')
+        assert status == 200
+        assert metrics['requests'] == 2 and metrics['solved'] == 2 and metrics['cache_hits'] == 1
+        assert (await request(port, 'GET', '/nowhere'))[0] == 404
+        assert (await request(port, 'GET', '/solve'))[0] == 405
+    run_service(scenario)
+
+
+def test_simultaneous_requests_share_one_search():
+    async def scenario(service, port):
+        payload = {'board': HARDEST, 'timeout': 60}
+        results = await asyncio.gather(*(request(port, 'POST', '/solve', payload) for _ in range(3)))
+        assert all(status == 200 and body['length'] == 31 for status, body in results)
+        assert service.metrics['coalesced'] == 2
+    run_service(scenario)
+
+
+def test_backpressure_answers_503():
+    async def scenario(service, port):
+        payloads = [{'board': HARDEST}, {'board': '647850321'}]
+        results = await asyncio.gather(*(request(port, 'POST', '/solve', p) for p in payloads))
+        assert sorted(status for status, _ in results) == [200, 503]
+        assert service.metrics['rejected'] == 1
+    run_service(scenario, max_pending=1)
+
+
+def test_error_paths():
+    async def scenario(service, port):
+        assert (await request(port, 'POST', '/solve', raw_body=b'{no json'))[0] == 400
+        assert (await request(port, 'POST', '/solve', {'engine': 'a_star'}))[0] == 400
+        assert (await request(port, 'POST', '/solve', {'board': '12345678'}))[0] == 400
+        assert (await request(port, 'POST', '/solve', {'board': HARDEST, 'engine': 'nope'}))[0] == 400
+        assert (await request(port, 'POST', '/solve', raw_body=b'', length='abc'))[0] == 400
+
+        async def broken(_):
+            raise RuntimeError("fallo")
+        service.solve = broken
+        status, body = await request(port, 'POST', '/solve', {'board': HARDEST})
+        assert status == 500 and 'fallo' in body['error']
+        assert service.metrics['errors'] == 5
+    run_service(scenario)
@@ -0,0 +1,32 @@
+import pytest
+
+from PuzzletBits import pack
+from PuzzletBatch import solve_board
+from PuzzletHeuristics import get_heuristic
+from PuzzletSMA import sma_star_packed, NODE_BYTES
+
+
+@pytest.mark.parametrize('max_nodes', [None, 2000])
+def test_sma_star_is_optimal(max_nodes, corpus, goal, assert_optimal_path):
+    heuristic = get_heuristic('manhattan', goal)
+    for board, optimal in corpus:
+        path = sma_star_packed(pack(board), pack(goal), heuristic, max_nodes=max_nodes)
+        assert_optimal_path(path, board, optimal)
+
+
+def test_sma_star_gives_up_when_the_path_does_not_fit(goal):
+    heuristic = get_heuristic('manhattan', goal)
+    # A dos movimientos de la meta: el camino necesita tres nodos en memoria
+    board = (1, 2, 3, 4, 5, 6, 0, 7, 8)
+    assert sma_star_packed(pack(board), pack(goal), heuristic, max_nodes=2) is None
+    assert len(sma_star_packed(pack(board), pack(goal), heuristic, max_nodes=3)) == 3
+    with pytest.raises(ValueError):
+        sma_star_packed(pack(board), pack(goal), heuristic, max_nodes=1)
+
+
+def test_sma_cap_through_solve_board(corpus):
+    board, optimal = corpus[-1]
+    assert solve_board(board, 'sma', options={'max_bytes': 3000 * NODE_BYTES})['length'] == optimal
+    assert solve_board((1, 2, 3, 4, 5, 6, 0, 7, 8), 'sma', options={'max_nodes': 2})['moves'] is None
+    with pytest.raises(ValueError):
+        solve_board(board, 'sma', options={'max_nodes': 0})
@@ -0,0 +1,59 @@
+import random
+from collections import deque
+from itertools import permutations
+
+import numpy as np
+
+from PuzzletBits import pack, standard_goal, neighbors_packed
+from PuzzletBench import random_walk
+from PuzzletBidir import bidirectional_search
+from PuzzletIDA import ida_star
+from PuzzletSolvable import is_solvable
+
+
+# Intercambia dos fichas que no son el vacío: cambia la paridad
+def swap_two_tiles(tiles):
+    tiles = list(tiles)
+    first, second = [i for i, t in enumerate(tiles) if t != 0][:2]
+    tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tuple(tiles)
+
+
+def test_random_walks_are_solvable_and_swaps_are_not():
+    rng = random.Random(5)
+    for size in (3, 4, 5):
+        goal = standard_goal(size)
+        for depth in (0, 1, 2, 9, 30):
+            board = random_walk(rng, depth, size)
+            assert is_solvable(board, goal)
+            assert not is_solvable(swap_two_tiles(board), goal)
+
+
+def test_parity_matches_reachability_on_2x2():
+    goal = standard_goal(2)
+    reachable = {pack(goal)}
+    queue = deque(reachable)
+    while queue:
+        for neighbor in neighbors_packed(queue.popleft(), 2):
+            if neighbor not in reachable:
+                reachable.add(neighbor)
+                queue.append(neighbor)
+    for board in permutations(range(4)):
+        assert is_solvable(board, goal) == (pack(board) in reachable)
+
+
+def test_classic_15_puzzle_with_14_and_15_swapped_is_unsolvable():
+    board = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 15, 14, 0)
+    assert not is_solvable(board, standard_goal(4))
+
+
+def test_mismatched_tiles_are_unsolvable():
+    assert not is_solvable((1, 2, 3, 4, 5, 6, 7, 8, 8), standard_goal(3))
+    assert not is_solvable((1, 2, 3, 0), standard_goal(3))
+
+
+def test_ida_star_and_bidirectional_stop_on_unsolvable_boards():
+    board = np.array([[2, 1, 3], [4, 5, 6], [7, 8, 0]])
+    goal = np.array(standard_goal(3)).reshape(3, 3)
+    assert ida_star(board, goal) == (None, None)
+    assert bidirectional_search(board, goal) == (None, None)
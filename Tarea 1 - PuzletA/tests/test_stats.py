@@ -0,0 +1,30 @@
+import tracemalloc
+
+from PuzzletBatch import solve_board
+from PuzzletStats import SolveStats
+
+
+def test_stats_are_filled_by_a_search(corpus):
+    board, optimal = corpus[-1]
+    stats = SolveStats()
+    result = solve_board(board, 'a_star', 'manhattan', stats=stats)
+    assert result['stats']['solution_length'] == optimal
+    assert stats.nodes_expanded > 0 and stats.nodes_generated >= stats.nodes_expanded
+    assert stats.peak_memory is None
+    assert stats.process_max_rss is None or stats.process_max_rss > 0
+
+
+def test_track_memory_leaves_the_callers_tracing_on():
+    tracemalloc.start()
+    try:
+        stats = SolveStats(track_memory=True).start()
+        stats.finish(0)
+        assert tracemalloc.is_tracing()
+        assert stats.peak_memory is not None
+    finally:
+        tracemalloc.stop()
+
+    stats = SolveStats(track_memory=True).start()
+    assert tracemalloc.is_tracing()
+    stats.finish(0)
+    assert not tracemalloc.is_tracing()